@@ -0,0 +1,60 @@
+"""
+멀티 프로세스 변환 엔진
+=======================
+마크다운 렌더링, Pygments 하이라이트, base64 인코딩, 이미지 복사는
+모두 CPU/디스크 작업이므로 노트 여러 개를 ProcessPoolExecutor로 나눠 변환합니다.
+
+동시에 진행 중인(아직 소비되지 않은) 결과 수를 max_in_flight로 제한하여
+메모리 사용량을 일정하게 유지하고, 끝난 결과는 완료 순서대로 돌려줍니다.
+소비하는 쪽(브라우저 주입, git 커밋)이 느리면 새 작업 제출도 그만큼 늦춰집니다.
+표준 라이브러리만 사용합니다.
+"""
+
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+
+def default_workers():
+    """기본 작업 프로세스 수: CPU 코어 수."""
+    return os.cpu_count() or 1
+
+
+def create_executor(workers=None):
+    """변환용 프로세스 풀을 만듭니다.
+    크롬 실행 스레드가 돌고 있을 수 있으므로 fork 대신 spawn으로 시작합니다."""
+    return ProcessPoolExecutor(
+        max_workers=workers or default_workers(),
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def iter_completed(executor, tasks, max_in_flight):
+    """tasks의 (key, fn, args)를 풀에 제출하고 완료 순서대로 (key, 결과, 에러)를 yield 합니다.
+
+    제출했지만 아직 yield 하지 않은 작업은 최대 max_in_flight개입니다.
+    작업 하나가 실패해도 나머지는 계속 진행되며, 에러는 세 번째 값으로 전달됩니다.
+    """
+    tasks = iter(tasks)
+    pending = {}
+
+    def fill():
+        while len(pending) < max_in_flight:
+            try:
+                key, fn, args = next(tasks)
+            except StopIteration:
+                return
+            pending[executor.submit(fn, *args)] = key
+
+    fill()
+    while pending:
+        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = pending.pop(future)
+            # 소비하는 동안에도 작업 프로세스가 쉬지 않도록 먼저 채워 둔다
+            fill()
+            try:
+                result, error = future.result(), None
+            except Exception as e:
+                result, error = None, e
+            yield key, result, error
@@ -15,7 +15,7 @@ import sys
 import os
 import subprocess
 
-REQUIRED_PACKAGES = ["PyYAML"]
+REQUIRED_PACKAGES = ["PyYAML", "Pillow"]
 
 def _bootstrap():
     """가상환경이 아니면 자동으로 생성하고 패키지를 설치한 뒤 재실행합니다."""
@@ -56,13 +56,19 @@ _bootstrap()
 # ──────────────────────────────────────────────
 # 여기서부터는 가상환경 안에서 실행됩니다
 # ──────────────────────────────────────────────
+import io
 import re
 import glob
 import json
 import shutil
+import base64
 import datetime
 import yaml
 
+import upnote_core
+import job_journal
+import note_catalog
+
 
 # ── 설정 파일 관리 ──
 
@@ -196,6 +202,62 @@ def select_categories(cat_tree):
             print(f"  0~{new_num} 사이의 숫자를 입력해 주세요.")
 
 
+# ── 대표 이미지 미리보기 (LQIP) ──
+
+LQIP_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".github_uploader_lqip")
+LQIP_SIZE = 32
+
+def make_lqip(image):
+    """대표 이미지로 아주 작은 흐린 미리보기(data URI)를 만듭니다.
+    이미지 해시별로 캐시하므로 같은 이미지는 다시 디코딩하지 않습니다. 실패하면 None."""
+    cache_path = os.path.join(LQIP_CACHE_DIR, f"{image['sha256']}.txt")
+    if os.path.exists(cache_path):
+        with open(cache_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    try:
+        from PIL import Image, ImageFilter
+    except ImportError:
+        print("  (Pillow가 없어 LQIP를 건너뜁니다)")
+        return None
+
+    try:
+        with Image.open(image["abs_path"]) as img:
+            img.draft("RGB", (LQIP_SIZE * 2, LQIP_SIZE * 2))  # JPEG는 축소 디코딩
+            img = img.convert("RGB")
+            img.thumbnail((LQIP_SIZE, LQIP_SIZE))
+            img = img.filter(ImageFilter.GaussianBlur(1))
+            buf = io.BytesIO()
+            img.save(buf, format="WEBP", quality=40)
+    except OSError as e:
+        print(f"  ✗ LQIP 생성 실패: {image['rel_path']} ({e})")
+        return None
+
+    lqip = "data:image/webp;base64," + base64.b64encode(buf.getvalue()).decode("utf-8")
+
+    # 작업 프로세스끼리 겹쳐 쓰지 않도록 임시 파일에 쓴 뒤 교체
+    os.makedirs(LQIP_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(lqip)
+    os.replace(tmp_path, cache_path)
+    return lqip
+
+
+def pick_preview_block(doc, preview):
+    """대표 이미지 블록을 고릅니다. preview: "first" 또는 이미지 파일 이름. 없으면 None."""
+    blocks = [b for b in doc["blocks"] if b["type"] == "image" and b["image"]["exists"]]
+    if not blocks:
+        return None
+    if preview == "first":
+        return blocks[0]
+    for block in blocks:
+        if preview in (block["image"]["rel_path"], os.path.basename(block["image"]["rel_path"])):
+            return block
+    print(f"  ✗ 대표 이미지를 찾을 수 없습니다: {preview}")
+    return None
+
+
 # ── 마크다운 변환 ──
 
 def make_slug(title):
@@ -205,26 +267,17 @@ def make_slug(title):
     return slug.lower()
 
 
-def convert_upnote_to_jekyll(md_file_path, blog_dir, categories, tags=None, author="Seong Gi"):
-    """UpNote 마크다운을 Chirpy 형식으로 변환하고 블로그 저장소에 복사합니다."""
+def write_jekyll_post(doc, blog_dir, categories, tags=None, author="Seong Gi", preview=None,
+                      date=None):
+    """중간 문서(upnote_core.parse_note)를 Chirpy 형식으로 변환하고 블로그 저장소에 복사합니다.
+    preview("first" 또는 이미지 파일 이름)가 주어지면 front matter에 image(path + lqip)를 넣습니다.
+    date("YYYY-MM-DD")를 주면 오늘 대신 그 날짜로 씁니다 (이미 올린 글을 같은 파일로 갱신할 때)."""
 
-    with open(md_file_path, "r", encoding="utf-8") as f:
-        content = f.read()
-
-    source_dir = os.path.dirname(md_file_path)
-    files_dir = os.path.join(source_dir, "Files")
-
-    # 제목 추출
-    title_match = re.match(r"^#\s+(.+)$", content, re.MULTILINE)
-    if title_match:
-        title = title_match.group(1).strip()
-        content = content[:title_match.start()] + content[title_match.end():]
-        content = content.lstrip("\n")
-    else:
-        title = os.path.splitext(os.path.basename(md_file_path))[0]
+    files_dir = os.path.join(doc["source_dir"], "Files")
+    title = doc["title"]
 
     slug = make_slug(title)
-    today = datetime.date.today().strftime("%Y-%m-%d")
+    today = date or datetime.date.today().strftime("%Y-%m-%d")
     post_filename = f"{today}-{slug}.md"
 
     # 이미지 처리
@@ -243,31 +296,43 @@ def convert_upnote_to_jekyll(md_file_path, blog_dir, categories, tags=None, auth
                 print(f"  이미지 복사: {img_file}")
 
     # 이미지 경로 변환
-    def replace_image_path(match):
-        alt = match.group(1)
-        img_path = match.group(2)
-        img_name = img_path
+    def post_image_url(block):
+        img_name = block["raw_path"]
         if img_name.startswith("Files/"):
             img_name = img_name[6:]
-        return f"![{alt}](/assets/images/posts/{slug}/{img_name})"
+        return f"/assets/images/posts/{slug}/{img_name}"
 
-    content = re.sub(
-        r"!\[([^\]]*)\]\(([^)]+)\)",
-        replace_image_path,
-        content
-    )
+    def replace_image_path(block):
+        img_md = f"![{block['alt']}]({post_image_url(block)})"
+        if not block["image"]["exists"]:
+            return img_md
+        # Kramdown 속성 목록으로 크기 + 지연 로딩 지정
+        return img_md + f"{{: {upnote_core.image_attrs(block['image'])} }}"
+
+    content = upnote_core.render_blocks(doc, replace_image_path)
 
     # Chirpy front matter 생성
     cat_str = json.dumps(categories, ensure_ascii=False)
     tag_str = json.dumps(tags, ensure_ascii=False) if tags else "[]"
 
+    # 대표 이미지 (홈 카드/글 머리 미리보기)
+    image_str = ""
+    preview_block = pick_preview_block(doc, preview) if preview else None
+    if preview_block:
+        image_str = f"image:\n  path: {post_image_url(preview_block)}\n"
+        lqip = make_lqip(preview_block["image"])
+        if lqip:
+            image_str += f"  lqip: {lqip}\n"
+        if preview_block["alt"]:
+            image_str += f"  alt: {json.dumps(preview_block['alt'], ensure_ascii=False)}\n"
+
     front_matter = f"""---
 title: {title}
 author: {author}
 date: {today}
 categories: {cat_str}
 tags: {tag_str}
----
+{image_str}---
 
 """
 
@@ -292,6 +357,13 @@ tags: {tag_str}
     }
 
 
+def convert_upnote_to_jekyll(md_file_path, blog_dir, categories, tags=None, author="Seong Gi",
+                             preview=None):
+    """UpNote 마크다운을 Chirpy 형식으로 변환하고 블로그 저장소에 복사합니다."""
+    doc = upnote_core.parse_note(md_file_path)
+    return write_jekyll_post(doc, blog_dir, categories, tags, author, preview)
+
+
 # ── 블로그 경로 해석 (URL → 로컬 클론) ──
 
 def _resolve_blog_dir(user_input):
@@ -347,11 +419,40 @@ def _resolve_blog_dir(user_input):
 
 # ── Git 자동화 ──
 
-def git_push(blog_dir, commit_message):
-    """변경사항을 커밋하고 push 합니다."""
+def git_commit(blog_dir, commit_message, paths=None, removed_paths=None):
+    """변경사항을 커밋합니다. paths가 주어지면 해당 경로만 커밋하며,
+    그 경로에 바뀐 것이 없으면 커밋 없이 성공으로 처리합니다.
+    removed_paths는 같은 커밋에서 git rm 할 경로입니다 (제목이 바뀌어 파일 이름이 달라진 글 등)."""
+    pathspec = ["--"] + list(paths) if paths else []
+    try:
+        removed = []
+        for path in removed_paths or []:
+            tracked = subprocess.check_output(["git", "ls-files", "--", path], cwd=blog_dir)
+            if tracked.strip():
+                subprocess.check_call(["git", "rm", "-r", "-q", "--", path], cwd=blog_dir)
+                removed.append(path)
+            elif os.path.isdir(path):
+                shutil.rmtree(path)
+            elif os.path.exists(path):
+                os.remove(path)
+        subprocess.check_call(["git", "add", "-A"] + pathspec, cwd=blog_dir)
+        if pathspec:
+            pathspec += removed
+        # 해당 경로에 커밋할 변경이 없으면 이전 실행에서 이미 커밋된 것으로 본다
+        if paths and subprocess.call(
+                ["git", "diff", "--cached", "--quiet"] + pathspec, cwd=blog_dir) == 0:
+            print("  (커밋할 변경 없음 - 이미 커밋되어 있습니다)")
+            return True
+        subprocess.check_call(["git", "commit", "-m", commit_message] + pathspec, cwd=blog_dir)
+        return True
+    except subprocess.CalledProcessError as e:
+        print(f"\n[에러] git 명령 실패: {e}")
+        return False
+
+
+def git_push_commits(blog_dir):
+    """커밋된 변경사항을 push 합니다."""
     try:
-        subprocess.check_call(["git", "add", "-A"], cwd=blog_dir)
-        subprocess.check_call(["git", "commit", "-m", commit_message], cwd=blog_dir)
         subprocess.check_call(["git", "push"], cwd=blog_dir)
         return True
     except subprocess.CalledProcessError as e:
@@ -359,14 +460,16 @@ def git_push(blog_dir, commit_message):
         return False
 
 
-# ── 메인 ──
+def git_push(blog_dir, commit_message):
+    """변경사항을 커밋하고 push 합니다."""
+    return git_commit(blog_dir, commit_message) and git_push_commits(blog_dir)
 
-def main():
-    print()
-    print("=" * 55)
-    print("  GitHub Pages 블로그 자동 업로더")
-    print("=" * 55)
 
+# ── 발행 설정 입력 (저장소, 카테고리, 태그) ──
+
+def prompt_post_settings():
+    """블로그 저장소 경로, 카테고리, 태그를 입력받습니다.
+    (blog_dir, categories, tags)를 반환하고, 입력이 잘못되면 None."""
     config = load_config()
 
     # 블로그 저장소 경로
@@ -385,12 +488,12 @@ def main():
 
     if not blog_dir:
         print("[에러] 경로를 입력해 주세요.")
-        return
+        return None
 
     # URL이 입력된 경우 → 자동 클론
     blog_dir = _resolve_blog_dir(blog_dir)
     if blog_dir is None:
-        return
+        return None
 
     # 최신 상태로 업데이트 (git pull)
     print(">> 블로그 저장소 최신 상태 동기화 중...")
@@ -413,7 +516,7 @@ def main():
         main_cat = input("대분류 이름: ").strip()
         if not main_cat:
             print("[에러] 카테고리를 입력해 주세요.")
-            return
+            return None
         sub_cat = input("소분류 이름 (없으면 Enter): ").strip()
         categories = [main_cat, sub_cat] if sub_cat else [main_cat]
     else:
@@ -425,6 +528,22 @@ def main():
     tag_input = input("> ").strip()
     tags = [t.strip() for t in tag_input.split(",") if t.strip()] if tag_input else []
 
+    return blog_dir, categories, tags
+
+
+# ── 메인 ──
+
+def main():
+    print()
+    print("=" * 55)
+    print("  GitHub Pages 블로그 자동 업로더")
+    print("=" * 55)
+
+    settings = prompt_post_settings()
+    if settings is None:
+        return
+    blog_dir, categories, tags = settings
+
     # UpNote 폴더 경로
     print("\nUpNote에서 내보낸 폴더 경로를 입력하세요.")
     print("(.md 파일과 Files/ 이미지 폴더가 있는 경로)")
@@ -434,8 +553,8 @@ def main():
         print(f"[에러] 폴더를 찾을 수 없습니다: {target_dir}")
         return
 
-    # .md 파일 찾기
-    md_files = glob.glob(os.path.join(target_dir, "*.md"))
+    # 노트 선택 (하위 폴더 포함 카탈로그에서 검색/필터)
+    md_files = note_catalog.pick_notes(target_dir)
     if not md_files:
         print(f"[에러] 해당 폴더에 .md 파일이 없습니다: {target_dir}")
         return
@@ -448,7 +567,17 @@ def main():
     print("  마크다운 변환 + 이미지 복사")
     print("───────────────────────────────────────────────────────")
 
-    result = convert_upnote_to_jekyll(md_file, blog_dir, categories, tags)
+    doc = upnote_core.parse_note(md_file)
+
+    # 대표 이미지 선택 (front matter의 image + LQIP 미리보기)
+    preview = None
+    if any(image["exists"] for image in doc["images"].values()):
+        print("\n대표 이미지를 지정하세요 (Enter = 첫 번째 이미지, n = 사용 안 함, 또는 파일 이름)")
+        preview_input = input("> ").strip()
+        if preview_input.lower() not in ("n", "no"):
+            preview = preview_input or "first"
+
+    result = write_jekyll_post(doc, blog_dir, categories, tags, preview=preview)
 
     print(f"\n  제목: {result['title']}")
     print(f"  파일: {result['filename']}")
@@ -469,6 +598,11 @@ def main():
     if confirm in ("", "y", "yes"):
         success = git_push(blog_dir, commit_msg)
         if success:
+            # 발행 상태를 작업 저널에 기록 (카탈로그의 "발행 후 변경" 필터에 사용)
+            job_journal.record(job_journal.load_journal(), os.path.abspath(md_file),
+                               "github", "pushed",
+                               source_hash=job_journal.note_fingerprint(doc),
+                               output_path=result["dest_path"])
             print("\n" + "=" * 55)
             print("  완료! 1~2분 후 사이트에 반영됩니다.")
             print("=" * 55)
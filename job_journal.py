@@ -0,0 +1,184 @@
+"""
+업로드 작업 저널
+================
+여러 노트를 한꺼번에 발행할 때 노트 × 타깃마다 진행 상태를 기록하는
+추가 전용(JSONL) 저널입니다. 중간에 크롬이 죽거나 git push가 거절되어도
+다시 실행하면 마지막으로 끝난 단계 다음부터 이어서 진행합니다.
+
+저널 한 줄:
+    {"note": 노트 경로, "target": "tistory" | "github", "state": 상태,
+     "source_hash": 노트 지문, "output_hash": 변환 결과 해시, ..., "updated": 시각}
+
+발행 단계(saved, pushed)에 도달한 줄에는 "published": 시각 이 함께 기록됩니다.
+다시 변환하느라 상태가 converted로 돌아가도 마지막 발행 시각은 남습니다.
+
+같은 (note, target)의 줄은 뒤에 오는 값이 앞의 값을 덮어씁니다.
+표준 라이브러리만 사용합니다.
+"""
+
+import os
+import json
+import hashlib
+import datetime
+import tempfile
+import threading
+
+
+JOURNAL_DIR = os.path.join(os.path.expanduser("~"), ".upnote_jobs")
+JOURNAL_PATH = os.path.join(JOURNAL_DIR, "journal.jsonl")
+OUTPUT_DIR = os.path.join(JOURNAL_DIR, "outputs")
+
+# 진행 순서. 티스토리는 converted → injected → saved,
+# GitHub Pages는 converted → committed → pushed 순서로 진행됩니다.
+STATE_ORDER = ["pending", "converted", "injected", "saved", "committed", "pushed"]
+
+# 발행이 끝난 것으로 보는 상태 (티스토리 저장, GitHub push)
+PUBLISHED_STATES = ("saved", "pushed")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_lock = threading.Lock()
+
+
+# ── 저널 읽기/쓰기 ──
+
+def load_journal(path=JOURNAL_PATH):
+    """저널을 처음부터 재생하여 {(note, target): 항목} 을 반환합니다."""
+    journal = {}
+    if not os.path.exists(path):
+        return journal
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 기록 도중 중단되어 잘린 마지막 줄은 무시
+                continue
+            key = (entry["note"], entry["target"])
+            journal.setdefault(key, {}).update(entry)
+    return journal
+
+
+def record(journal, note, target, state, path=JOURNAL_PATH, **fields):
+    """(note, target)의 상태를 갱신하고 저널 파일 끝에 한 줄 추가합니다."""
+    now = datetime.datetime.now().isoformat(timespec="seconds")
+    entry = {"note": note, "target": target, "state": state, **fields, "updated": now}
+    if state in PUBLISHED_STATES:
+        entry["published"] = now
+
+    with _lock:
+        journal.setdefault((note, target), {}).update(entry)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 이전 기록이 잘린 채 끝났으면 줄을 바꾼 뒤 이어 쓴다
+        prefix = ""
+        if os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    prefix = "\n"
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(prefix + json.dumps(entry, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def get_entry(journal, note, target):
+    """(note, target) 항목을 반환합니다. 없으면 pending 상태의 빈 항목."""
+    return journal.get((note, target), {"state": "pending"})
+
+
+def reached(journal, note, target, state):
+    """(note, target)이 state 단계 이상까지 진행되었는지 확인합니다."""
+    current = get_entry(journal, note, target)["state"]
+    return STATE_ORDER.index(current) >= STATE_ORDER.index(state)
+
+
+# ── 변환 결과 검증 ──
+
+def note_fingerprint(doc):
+    """노트 본문과 이미지 해시로 만든 지문. 노트나 이미지가 바뀌면 달라집니다."""
+    h = hashlib.sha256(doc["sha256"].encode("utf-8"))
+    for rel_path in sorted(doc["images"]):
+        h.update(rel_path.encode("utf-8"))
+        h.update((doc["images"][rel_path]["sha256"] or "").encode("utf-8"))
+    return h.hexdigest()
+
+
+def save_output(text, output_dir=OUTPUT_DIR):
+    """변환 결과를 저장하고 그 해시를 반환합니다."""
+    output_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, f"{output_hash}.txt"), "w", encoding="utf-8") as f:
+        f.write(text)
+    return output_hash
+
+
+def load_output(output_hash, output_dir=OUTPUT_DIR):
+    """저장된 변환 결과를 불러옵니다. 없거나 내용이 바뀌었으면 None."""
+    if not output_hash:
+        return None
+    path = os.path.join(output_dir, f"{output_hash}.txt")
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        text = f.read()
+    if hashlib.sha256(text.encode("utf-8")).hexdigest() != output_hash:
+        return None
+    return text
+
+
+def _file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def new_output_file(output_dir=OUTPUT_DIR):
+    """큰 변환 결과를 조각조각 써 넣을 임시 파일을 엽니다 (바이너리 모드).
+    다 쓴 뒤 commit_output_file로 확정하고, 실패하면 discard_output_file로 지웁니다."""
+    os.makedirs(output_dir, exist_ok=True)
+    return tempfile.NamedTemporaryFile(dir=output_dir, suffix=".tmp", delete=False)
+
+
+def commit_output_file(f, output_dir=OUTPUT_DIR):
+    """new_output_file로 쓴 파일을 닫고 <해시>.html 로 확정한 뒤 해시를 반환합니다."""
+    f.close()
+    output_hash = _file_sha256(f.name)
+    os.replace(f.name, os.path.join(output_dir, f"{output_hash}.html"))
+    return output_hash
+
+
+def discard_output_file(f):
+    """new_output_file로 연 임시 파일을 닫고 지웁니다."""
+    f.close()
+    try:
+        os.remove(f.name)
+    except FileNotFoundError:
+        pass
+
+
+def output_file_path(output_hash, output_dir=OUTPUT_DIR):
+    """파일로 저장된 변환 결과의 경로를 반환합니다. 없거나 내용이 바뀌었으면 None."""
+    if not output_hash:
+        return None
+    path = os.path.join(output_dir, f"{output_hash}.html")
+    if not os.path.exists(path) or _file_sha256(path) != output_hash:
+        return None
+    return path
+
+
+def remove_output(output_hash, output_dir=OUTPUT_DIR):
+    """더 이상 필요 없는 변환 결과를 지웁니다. 이미 없으면 무시합니다."""
+    if not output_hash:
+        return
+    for ext in (".txt", ".html"):
+        try:
+            os.remove(os.path.join(output_dir, f"{output_hash}{ext}"))
+        except FileNotFoundError:
+            pass
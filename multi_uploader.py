@@ -0,0 +1,501 @@
+"""
+멀티 타깃 업로더
+================
+UpNote에서 내보낸 마크다운(.md) 노트를 한 번만 읽고(upnote_core),
+티스토리와 GitHub Pages 블로그에 동시에 발행하는 스크립트입니다.
+
+입력은 모두 처음에 받고, 각 타깃의 발행 작업은 스레드에서 병렬로 진행됩니다.
+여러 노트를 고르면 프로세스 풀(convert_pool)에서 CPU 코어 수만큼 나눠 변환하고
+끝나는 순서대로 발행합니다. 진행 상태는 작업 저널(job_journal)에
+기록되어 중간에 실패해도 다시 실행하면 이어서 진행합니다.
+처음 실행 시 자동으로 가상환경(.venv) 생성 및 패키지 설치가 진행됩니다.
+"""
+
+# ──────────────────────────────────────────────
+# 자동 환경 설정 (venv 생성 + 패키지 설치)
+# ──────────────────────────────────────────────
+import sys
+import os
+import subprocess
+
+REQUIRED_PACKAGES = ["selenium", "webdriver-manager", "pyperclip", "markdown", "PyYAML", "Pillow"]
+
+def _bootstrap():
+    """가상환경이 아니면 자동으로 생성하고 패키지를 설치한 뒤 재실행합니다."""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    venv_dir = os.path.join(script_dir, ".venv")
+
+    if sys.platform == "win32":
+        venv_python = os.path.join(venv_dir, "Scripts", "python.exe")
+    else:
+        venv_python = os.path.join(venv_dir, "bin", "python")
+
+    # 이미 가상환경 안에서 실행 중이면 그대로 진행
+    if sys.prefix != sys.base_prefix:
+        return
+
+    print("=" * 55)
+    print("  초기 환경 설정 (최초 1회만 실행됩니다)")
+    print("=" * 55)
+
+    if not os.path.exists(venv_python):
+        print("\n>> 가상환경 생성 중... (.venv)")
+        subprocess.check_call([sys.executable, "-m", "venv", venv_dir])
+        print("   완료!")
+
+    print(">> 필수 패키지 설치 중...")
+    subprocess.check_call(
+        [venv_python, "-m", "pip", "install", "--upgrade", "pip", "-q"],
+    )
+    subprocess.check_call(
+        [venv_python, "-m", "pip", "install"] + REQUIRED_PACKAGES + ["-q"],
+    )
+    print("   완료!\n")
+
+    os.execv(venv_python, [venv_python] + sys.argv)
+
+_bootstrap()
+
+# ──────────────────────────────────────────────
+# 여기서부터는 가상환경 안에서 실행됩니다
+# ──────────────────────────────────────────────
+import re
+import glob
+import json
+import datetime
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+
+import upnote_core
+import convert_pool
+import job_journal
+import note_catalog
+import tistory_uploader
+import github_uploader
+
+
+# 발행 후 노트가 바뀌지 않아 다시 발행하지 않은 작업 (변환 결과 대신 반환)
+UNCHANGED = "unchanged"
+
+# 발행 후 노트가 바뀌었지만 자동으로 다시 발행하지 않은 작업 (티스토리: 새 글이 중복으로 생김)
+CHANGED = "changed"
+
+
+def _modified_since(note, entry):
+    """노트 파일이 저널에 기록된 마지막 발행(없으면 마지막 기록) 이후 수정되었는지 확인합니다."""
+    published = entry.get("published", entry["updated"])
+    return os.path.getmtime(note) > datetime.datetime.fromisoformat(published).timestamp()
+
+
+# ── 타깃: 티스토리 ──
+
+def _prepare_tistory():
+    """티스토리 발행에 필요한 입력을 받습니다."""
+    print("\n티스토리 블로그 ID를 입력하세요 (예: chsk)")
+    blog_id = input("> ").strip()
+    if not blog_id:
+        print("[에러] 블로그 ID가 필요합니다.")
+        return None
+
+    # 크롬 실행/글쓰기 페이지 이동은 나머지 입력 및 파싱과 동시에 진행
+    write_page = tistory_uploader.start_write_page(blog_id)
+
+    image_url_map = None
+    reuse = input("\n업로드된 이미지 URL을 재사용할까요? (Y/n): ").strip().lower()
+    if reuse in ("", "y", "yes"):
+        image_url_map = tistory_uploader.load_image_url_map()
+
+    low_memory, memory_budget_mb = tistory_uploader.prompt_memory_options()
+    return {"blog_id": blog_id, "image_url_map": image_url_map, "write_page": write_page,
+            "low_memory": low_memory, "memory_budget_mb": memory_budget_mb}
+
+
+def _plan_tistory(note, options, journal):
+    """저장된 뒤 수정되지 않은 노트는 None (건너뜀), 아니면 변환 인자를 반환합니다."""
+    entry = job_journal.get_entry(journal, note, "tistory")
+    if job_journal.reached(journal, note, "tistory", "saved"):
+        if not _modified_since(note, entry):
+            print(f"  [tistory] 이미 저장됨 (건너뜀): {os.path.basename(note)}")
+            return None
+        # 저장 후 수정된 노트는 내용이 정말 바뀌었는지만 변환 단계에서 확인
+        return (options["image_url_map"], None, entry.get("source_hash", ""), options["low_memory"])
+    reuse_fingerprint = entry.get("source_hash") if job_journal.reached(
+        journal, note, "tistory", "converted") else None
+    return (options["image_url_map"], reuse_fingerprint, None, options["low_memory"])
+
+
+def _convert_tistory(doc, fingerprint, image_url_map, reuse_fingerprint, published_fingerprint,
+                     low_memory):
+    """(작업 프로세스) HTML 변환. 이전 변환 결과를 쓸 수 있으면 None.
+
+    저메모리 모드(low_memory가 None이면 이미지가 큰 노트)는 저널 결과 파일에 바로 조립하고
+    {"title", "output_hash", "peak"}만 돌려줍니다 (HTML 전체를 프로세스 간에 주고받지 않음).
+    peak는 이 작업 프로세스에서 tracemalloc으로 잰 변환 피크 메모리(bytes)입니다.
+    """
+    if published_fingerprint is not None:
+        # 저장된 글을 다시 발행하면 티스토리에 새 글이 하나 더 생기므로 바뀌었는지만 알린다
+        return UNCHANGED if fingerprint == published_fingerprint else CHANGED
+    if fingerprint == reuse_fingerprint:
+        return None
+    if low_memory is None:
+        low_memory = tistory_uploader.needs_low_memory(doc)
+    if not low_memory:
+        return tistory_uploader.render_tistory_html(doc, image_url_map)
+
+    out = job_journal.new_output_file()
+    tracemalloc.start()
+    try:
+        title, _ = tistory_uploader.render_tistory_html_to_file(doc, image_url_map, out)
+        _, peak = tracemalloc.get_traced_memory()
+    except BaseException:
+        job_journal.discard_output_file(out)
+        raise
+    finally:
+        tracemalloc.stop()
+    return {"title": title, "output_hash": job_journal.commit_output_file(out), "peak": peak}
+
+
+def _load_tistory_output(entry, doc):
+    """저널에 기록된 이전 변환 결과를 (title, html_body 또는 HTML 파일)로 불러옵니다. 없으면 None."""
+    path = job_journal.output_file_path(entry.get("output_hash"))
+    if path is not None:
+        return (entry.get("title", doc["title"]), open(path, "rb"))
+    cached = job_journal.load_output(entry.get("output_hash"))
+    if cached is None:
+        return None
+    cached = json.loads(cached)
+    return (cached["title"], cached["html_body"])
+
+
+def _publish_tistory(note, doc, fingerprint, rendered, options, journal):
+    if rendered == UNCHANGED:
+        print(f"  [tistory] 저장 후 내용이 바뀌지 않음 (건너뜀): {doc['title']}")
+        # 파일만 바뀐 노트가 계속 "발행 후 변경"으로 남지 않도록 발행 시각을 갱신
+        job_journal.record(journal, note, "tistory", "saved")
+        return None
+    if rendered == CHANGED:
+        print(f"  [tistory] 저장 후 수정됨 — 중복 글이 생기지 않도록 자동으로 다시 발행하지 않습니다. "
+              f"티스토리에서 기존 글을 직접 수정해 주세요: {doc['title']}")
+        return CHANGED
+
+    entry = job_journal.get_entry(journal, note, "tistory")
+    previous_hash = entry.get("output_hash")
+    output_hash = None
+    reused = rendered is None
+    if reused:
+        # 노트가 그대로이면 저널에 저장된 이전 변환 결과를 재사용
+        # (없으면 publish_to_tistory가 다시 변환)
+        rendered = _load_tistory_output(entry, doc)
+    elif isinstance(rendered, dict):
+        # 저메모리 변환 결과: 작업 프로세스가 이미 파일로 저장해 둠
+        tistory_uploader.report_peak_memory(
+            f"[tistory] {doc['title']} 변환", rendered["peak"], options["memory_budget_mb"])
+        output_hash = rendered["output_hash"]
+        job_journal.record(journal, note, "tistory", "converted", source_hash=fingerprint,
+                           output_hash=output_hash, title=rendered["title"])
+        path = job_journal.output_file_path(output_hash)
+        rendered = (rendered["title"], open(path, "rb")) if path else None
+    else:
+        output_hash = job_journal.save_output(
+            json.dumps({"title": rendered[0], "html_body": rendered[1]}, ensure_ascii=False))
+        job_journal.record(journal, note, "tistory", "converted",
+                           source_hash=fingerprint, output_hash=output_hash)
+
+    # 노트가 수정되어 새로 변환했으면 이전 변환 결과는 지운다 (노트 × 타깃마다 최신 1개만 유지)
+    if output_hash is not None and previous_hash != output_hash:
+        job_journal.remove_output(previous_hash)
+
+    def on_state(state, **info):
+        job_journal.record(journal, note, "tistory", state)
+        # 저장까지 끝난 글은 다시 주입할 일이 없으므로 변환 결과를 지운다
+        if state == "saved":
+            job_journal.remove_output(job_journal.get_entry(journal, note, "tistory").get("output_hash"))
+
+    # 두 번째 글부터는 열려 있는 크롬 창에서 글쓰기 페이지로 다시 이동
+    write_page = options.pop("write_page", None)
+    if write_page is None:
+        write_page = tistory_uploader.start_write_page(options["blog_id"], options.get("driver"))
+
+    success = tistory_uploader.publish_to_tistory(
+        doc, options["blog_id"], options["image_url_map"], write_page,
+        rendered=rendered, on_state=on_state, reused=reused and rendered is not None,
+        low_memory=options["low_memory"], memory_budget_mb=options["memory_budget_mb"],
+    )
+    options["driver"] = write_page.result()
+    return success
+
+
+# ── 타깃: GitHub Pages ──
+
+def _prepare_github():
+    """GitHub Pages 발행에 필요한 입력을 받습니다 (저장소, 카테고리, 태그)."""
+    settings = github_uploader.prompt_post_settings()
+    if settings is None:
+        return None
+    blog_dir, categories, tags = settings
+
+    # 노트마다 첫 번째 이미지를 대표 이미지(+ LQIP 미리보기)로 사용
+    use_preview = input("\n첫 번째 이미지를 대표 이미지로 넣을까요? (Y/n): ").strip().lower()
+    preview = "first" if use_preview in ("", "y", "yes") else None
+
+    return {"blog_dir": blog_dir, "categories": categories, "tags": tags, "preview": preview}
+
+
+def _plan_github(note, options, journal):
+    """push된 뒤 수정되지 않은 노트는 None (건너뜀), 아니면 변환 인자를 반환합니다."""
+    entry = job_journal.get_entry(journal, note, "github")
+    settings = (options["blog_dir"], options["categories"], options["tags"], options["preview"])
+    if job_journal.reached(journal, note, "github", "pushed"):
+        if not _modified_since(note, entry):
+            print(f"  [github] 이미 push됨 (건너뜀): {os.path.basename(note)}")
+            return None
+        # push 후 수정된 노트는 같은 글 파일을 갱신한다 (내용이 같으면 변환 단계에서 건너뜀)
+        previous = {"output_path": entry.get("output_path"), "republish": True}
+        return settings + (False, None, entry.get("source_hash"), previous)
+    push_only = job_journal.reached(journal, note, "github", "committed")
+    reuse_fingerprint = entry.get("source_hash") if job_journal.reached(
+        journal, note, "github", "converted") else None
+    previous = {key: entry.get(key) for key in
+                ("output_path", "output_hash", "removed_paths", "republish")}
+    return settings + (push_only, reuse_fingerprint, None, previous)
+
+
+# _posts/ 글 파일 이름: YYYY-MM-DD-slug.md
+POST_FILENAME_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})-(.+)\.md$")
+
+
+def _find_post(blog_dir, slug):
+    """저널에 경로가 없는 예전 발행 글을 slug로 찾습니다. 하나일 때만 반환합니다."""
+    matches = glob.glob(os.path.join(blog_dir, "_posts", f"????-??-??-{glob.escape(slug)}.md"))
+    return matches[0] if len(matches) == 1 else None
+
+
+def _convert_github(doc, fingerprint, blog_dir, categories, tags, preview, push_only,
+                    reuse_fingerprint, published_fingerprint, previous):
+    """(작업 프로세스) _posts/ 글 작성 + 이미지 복사. 이전 결과가 유효하면 다시 만들지 않습니다.
+
+    previous는 저널에 남은 이전 결과 (output_path, output_hash, removed_paths, republish)입니다.
+    이미 만든 글이 있으면 같은 날짜의 같은 파일을 갱신하고, 제목이 바뀌어 파일 이름이
+    달라지면 이전 글과 이미지 폴더를 removed_paths로 돌려주어 같은 커밋에서 지웁니다.
+    """
+    if fingerprint == published_fingerprint:
+        return UNCHANGED
+    if push_only:
+        return None
+
+    slug = github_uploader.make_slug(doc["title"])
+    image_dir = os.path.join(blog_dir, "assets", "images", "posts", slug)
+    output_path = previous.get("output_path")
+    if (fingerprint == reuse_fingerprint and output_path and os.path.exists(output_path)
+            and upnote_core.file_sha256(output_path) == previous.get("output_hash")):
+        return {"result": None, "output_path": output_path, "image_dir": image_dir,
+                "removed_paths": previous.get("removed_paths") or [],
+                "republish": bool(previous.get("republish"))}
+
+    if output_path is None and previous.get("republish"):
+        output_path = _find_post(blog_dir, slug)
+    match = POST_FILENAME_PATTERN.match(os.path.basename(output_path)) if output_path else None
+
+    result = github_uploader.write_jekyll_post(doc, blog_dir, categories, tags, preview=preview,
+                                               date=match.group(1) if match else None)
+
+    removed = list(previous.get("removed_paths") or [])
+    if output_path and os.path.abspath(output_path) != os.path.abspath(result["dest_path"]):
+        removed.append(output_path)
+        if match and match.group(2) != slug:
+            removed.append(os.path.join(blog_dir, "assets", "images", "posts", match.group(2)))
+    # 제목을 원래대로 되돌린 경우 지금 쓴 글/이미지는 지우지 않는다
+    keep = {os.path.abspath(result["dest_path"]), os.path.abspath(image_dir)}
+    removed = [p for p in dict.fromkeys(removed) if os.path.abspath(p) not in keep]
+
+    return {
+        "result": result,
+        "output_path": result["dest_path"],
+        "output_hash": upnote_core.file_sha256(result["dest_path"]),
+        "image_dir": image_dir,
+        "removed_paths": removed,
+        "republish": bool(output_path) or bool(previous.get("republish")),
+    }
+
+
+def _publish_github(note, doc, fingerprint, converted, options, journal):
+    if converted == UNCHANGED:
+        print(f"  [github] push 후 내용이 바뀌지 않음 (건너뜀): {doc['title']}")
+        # 파일만 바뀐 노트가 계속 "발행 후 변경"으로 남지 않도록 발행 시각을 갱신
+        job_journal.record(journal, note, "github", "pushed")
+        return None
+
+    blog_dir = options["blog_dir"]
+
+    if converted is not None:
+        result = converted["result"]
+        if result is None:
+            print(f"  [github] 이전 변환 결과 재사용: {os.path.basename(converted['output_path'])}")
+        else:
+            action = "갱신" if converted["republish"] else "생성"
+            print(f"  [github] {result['filename']} {action} (이미지 {result['image_count']}개)")
+            job_journal.record(journal, note, "github", "converted",
+                               source_hash=fingerprint,
+                               output_hash=converted["output_hash"],
+                               output_path=converted["output_path"],
+                               removed_paths=converted["removed_paths"],
+                               republish=converted["republish"])
+        for path in converted["removed_paths"]:
+            print(f"  [github] 이전 파일 삭제: {os.path.relpath(path, blog_dir)}")
+
+        # 다른 노트가 동시에 변환 중이므로 이 노트의 파일만 커밋
+        paths = [p for p in (converted["output_path"], converted["image_dir"]) if os.path.exists(p)]
+        verb = "글 수정" if converted["republish"] else "새 글 추가"
+        if not github_uploader.git_commit(blog_dir, f"{verb}: {doc['title']}", paths,
+                                          removed_paths=converted["removed_paths"]):
+            return False
+        job_journal.record(journal, note, "github", "committed")
+
+    if not github_uploader.git_push_commits(blog_dir):
+        return False
+    job_journal.record(journal, note, "github", "pushed")
+    return True
+
+
+# 타깃 등록: 이름 → (표시 이름, 입력, 계획, 변환(작업 프로세스), 발행)
+TARGETS = {
+    "tistory": ("티스토리", _prepare_tistory, _plan_tistory, _convert_tistory, _publish_tistory),
+    "github": ("GitHub Pages", _prepare_github, _plan_github, _convert_github, _publish_github),
+}
+
+
+# ── 변환(프로세스 풀) → 발행(타깃별 스레드) ──
+
+def _convert_note(md_file, plans):
+    """(작업 프로세스) 노트를 한 번 파싱하고 타깃별 변환을 수행합니다."""
+    doc = upnote_core.parse_note(md_file)
+    fingerprint = job_journal.note_fingerprint(doc)
+    payloads = {name: TARGETS[name][3](doc, fingerprint, *args) for name, args in plans.items()}
+    return doc, fingerprint, payloads
+
+
+def publish_notes(md_files, target_options, journal, workers=None, max_in_flight=None):
+    """노트들을 프로세스 풀에서 변환하고, 끝나는 순서대로 타깃별 발행 스레드에 넘깁니다.
+    {노트 경로: {타깃: 성공 여부}}를 반환합니다. 이미 발행되어 건너뛴 작업은 None,
+    발행 후 수정되었지만 자동으로 다시 발행하지 않은 작업은 CHANGED입니다.
+
+    타깃마다 발행 대기 중인 결과도 max_in_flight개로 제한하므로
+    티스토리 주입처럼 느린 단계가 있어도 메모리에 쌓이는 결과 수는 일정합니다.
+    """
+    workers = workers or convert_pool.default_workers()
+    max_in_flight = max_in_flight or workers * 2
+    results = {os.path.abspath(md_file): {} for md_file in md_files}
+
+    def tasks():
+        for md_file in md_files:
+            note = os.path.abspath(md_file)
+            plans = {}
+            for name, options in target_options.items():
+                args = TARGETS[name][2](note, options, journal)
+                if args is None:
+                    results[note][name] = None
+                else:
+                    plans[name] = args
+            if plans:
+                yield (note, tuple(plans)), _convert_note, (note, plans)
+
+    publishers = {name: ThreadPoolExecutor(max_workers=1) for name in target_options}
+    slots = {name: threading.BoundedSemaphore(max_in_flight) for name in target_options}
+
+    def publish(name, note, doc, fingerprint, payload):
+        try:
+            ok = TARGETS[name][4](note, doc, fingerprint, payload, target_options[name], journal)
+            results[note][name] = ok if ok in (None, CHANGED) else bool(ok)
+        except (Exception, SystemExit) as e:
+            # 발행 스레드의 예외는 실행기가 삼키므로 여기서 반드시 실패로 기록
+            print(f"\n[에러] {TARGETS[name][0]} 발행 실패 ({os.path.basename(note)}): {e!r}")
+            results[note][name] = False
+        finally:
+            slots[name].release()
+
+    with convert_pool.create_executor(workers) as executor:
+        for (note, names), converted, error in convert_pool.iter_completed(
+                executor, tasks(), max_in_flight):
+            if error is not None:
+                print(f"\n[에러] 변환 실패 ({os.path.basename(note)}): {error}")
+                for name in names:
+                    results[note][name] = False
+                continue
+
+            doc, fingerprint, payloads = converted
+            print(f">> 변환 완료: {doc['title']} (이미지 {len(doc['images'])}개)")
+            for name, payload in payloads.items():
+                slots[name].acquire()
+                publishers[name].submit(publish, name, note, doc, fingerprint, payload)
+
+    for publisher in publishers.values():
+        publisher.shutdown(wait=True)
+    return results
+
+
+# ── 메인 ──
+
+def main():
+    print("=" * 55)
+    print("  멀티 타깃 업로더 (티스토리 + GitHub Pages)")
+    print("=" * 55)
+
+    print("\nUpNote에서 내보낸 폴더 경로를 입력하세요.")
+    print("(.md 파일과 Files/ 이미지 폴더가 있는 경로)")
+    target_dir = input("> ").strip()
+    if not target_dir or not os.path.isdir(target_dir):
+        print(f"[에러] 폴더를 찾을 수 없습니다: {target_dir}")
+        return
+
+    # 노트 선택 (하위 폴더 포함 카탈로그에서 검색/필터, 여러 개 가능)
+    selected = note_catalog.pick_notes(target_dir, multiple=True)
+    if not selected:
+        print(f"[에러] 해당 폴더에 .md 파일이 없습니다: {target_dir}")
+        return
+
+    print(f"\n>> 대상 파일: {len(selected)}개")
+
+    print(f"\n발행할 타깃을 입력하세요 (쉼표로 구분, 없으면 Enter = 전체)")
+    print(f"  선택 가능: {', '.join(TARGETS)}")
+    target_input = input("> ").strip()
+    names = [t.strip() for t in target_input.split(",") if t.strip()] if target_input else list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        print(f"[에러] 알 수 없는 타깃: {', '.join(unknown)}")
+        return
+
+    # 모든 입력을 먼저 받아 둔다 (발행 중에는 티스토리 에디터 확인용 Enter만 받음)
+    target_options = {}
+    for name in names:
+        options = TARGETS[name][1]()
+        if options is None:
+            return
+        target_options[name] = options
+
+    # 작업 저널: 이전 실행에서 끝난 단계는 건너뛰고 이어서 진행
+    journal = job_journal.load_journal()
+    if journal:
+        print(f"\n>> 작업 저널: {job_journal.JOURNAL_PATH} (이어서 진행)")
+
+    print(f"\n변환 프로세스 수를 입력하세요 (Enter = CPU 코어 수 {convert_pool.default_workers()})")
+    workers_input = input("> ").strip()
+    workers = int(workers_input) if workers_input.isdigit() and int(workers_input) > 0 else None
+
+    results = publish_notes(selected, target_options, journal, workers)
+
+    marks = {True: "✓", False: "✗", None: "- (이미 발행됨, 다시 발행하지 않음)",
+             CHANGED: "! (발행 후 수정됨, 기존 글을 직접 수정하세요)"}
+    print(f"\n{'='*55}")
+    for note, note_results in results.items():
+        status = ", ".join(
+            f"{TARGETS[name][0]} {marks[ok]}" for name, ok in note_results.items()
+        )
+        print(f"  {os.path.basename(note)}: {status}")
+    if any(ok is False for note_results in results.values() for ok in note_results.values()):
+        print("\n  실패한 작업은 다시 실행하면 이어서 진행됩니다.")
+    print(f"{'='*55}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+UpNote 노트 카탈로그
+====================
+UpNote 내보내기 폴더(하위 폴더 포함) 전체의 .md 노트 목록을 색인해 둡니다.
+노트마다 제목, 크기, 이미지 개수를 수정 시각(mtime)과 함께 저장하므로
+다시 스캔할 때는 바뀐 노트만 읽습니다.
+
+노트가 수천 개여도 제목 검색(부분/퍼지 일치)이나
+"마지막 발행 이후 변경됨" 같은 필터로 바로 고를 수 있습니다.
+발행 상태는 작업 저널(job_journal)에서 가져옵니다.
+표준 라이브러리만 사용합니다.
+"""
+
+import os
+import json
+import difflib
+import datetime
+
+import upnote_core
+import job_journal
+
+
+CATALOG_PATH = os.path.join(job_journal.JOURNAL_DIR, "catalog.json")
+
+# 노트가 아니라 첨부 이미지가 들어 있는 폴더
+SKIP_DIRS = {"Files"}
+
+SEARCH_LIMIT = 20
+
+
+# ── 카탈로그 저장/불러오기 ──
+
+def load_catalog(path=CATALOG_PATH):
+    """저장된 카탈로그를 불러옵니다. {내보내기 폴더: {노트 경로: 항목}}"""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_catalog(catalog, path=CATALOG_PATH):
+    """카탈로그를 파일에 저장합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(catalog, f, ensure_ascii=False)
+
+
+# ── 스캔 ──
+
+def _read_note_info(path):
+    """노트 파일에서 제목과 이미지 개수를 읽습니다."""
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        content = f.read()
+    title_match = upnote_core.TITLE_PATTERN.match(content)
+    if title_match:
+        title = title_match.group(1).strip()
+    else:
+        title = os.path.splitext(os.path.basename(path))[0]
+    return title, len(upnote_core.IMAGE_PATTERN.findall(content))
+
+
+def scan_export(root, catalog):
+    """내보내기 폴더를 os.scandir로 훑어 카탈로그를 갱신합니다.
+    mtime/크기가 그대로인 노트는 다시 읽지 않습니다. (노트 dict, 새로 읽은 개수)를 반환합니다."""
+    root = os.path.abspath(root)
+    previous = catalog.get(root, {})
+    notes = {}
+    read_count = 0
+
+    stack = [root]
+    while stack:
+        current = stack.pop()
+        try:
+            with os.scandir(current) as it:
+                for entry in it:
+                    if entry.name.startswith("."):
+                        continue
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name not in SKIP_DIRS:
+                            stack.append(entry.path)
+                        continue
+                    if not entry.name.lower().endswith(".md"):
+                        continue
+
+                    st = entry.stat()
+                    old = previous.get(entry.path)
+                    if old and old["mtime"] == st.st_mtime and old["size"] == st.st_size:
+                        notes[entry.path] = old
+                        continue
+
+                    title, image_count = _read_note_info(entry.path)
+                    notes[entry.path] = {
+                        "title": title,
+                        "size": st.st_size,
+                        "mtime": st.st_mtime,
+                        "image_count": image_count,
+                    }
+                    read_count += 1
+        except OSError as e:
+            print(f"  ✗ 폴더를 읽을 수 없습니다 (건너뜀): {current} ({e})")
+
+    catalog[root] = notes
+    return notes, read_count
+
+
+# ── 발행 상태 / 필터 / 검색 ──
+
+def published_times(journal):
+    """저널에서 노트별 마지막 발행 시각(timestamp)을 모읍니다. {노트 경로: timestamp}"""
+    times = {}
+    for (note, _target), entry in journal.items():
+        published = entry.get("published")
+        if published is None and entry.get("state") in job_journal.PUBLISHED_STATES:
+            published = entry["updated"]  # published 필드가 생기기 전의 저널
+        if published is not None:
+            ts = datetime.datetime.fromisoformat(published).timestamp()
+            times[note] = max(ts, times.get(note, ts))
+    return times
+
+
+def filter_notes(notes, published_map, mode):
+    """필터 적용: "changed" (미발행 또는 발행 후 수정됨), "unpublished", "published"."""
+    result = {}
+    for path, info in notes.items():
+        published = published_map.get(path)
+        if mode == "unpublished" and published is not None:
+            continue
+        if mode == "published" and published is None:
+            continue
+        if mode == "changed" and published is not None and info["mtime"] <= published:
+            continue
+        result[path] = info
+    return result
+
+
+def search_notes(notes, query, limit=None):
+    """제목으로 노트를 찾습니다. 부분 일치 → 글자 순서 일치 → 유사도 순으로 정렬합니다."""
+    query = query.lower().strip()
+    scored = []
+    for path, info in notes.items():
+        title = info["title"].lower()
+        if query in title:
+            score = 2.0 + len(query) / max(len(title), 1)
+        else:
+            it = iter(title)
+            if all(ch in it for ch in query.replace(" ", "")):
+                score = 1.0 + len(query) / max(len(title), 1)
+            else:
+                score = difflib.SequenceMatcher(None, query, title).ratio()
+                if score < 0.5:
+                    continue
+        scored.append((score, path))
+    scored.sort(key=lambda x: (-x[0], notes[x[1]]["title"]))
+    return [path for _, path in scored[:limit]]
+
+
+# ── 선택 UI ──
+
+def pick_notes(root, multiple=False):
+    """카탈로그를 갱신한 뒤 검색/필터로 노트를 고릅니다. 선택한 노트 경로 리스트를 반환합니다."""
+    catalog = load_catalog()
+    print(">> 노트 목록 스캔 중...")
+    notes, read_count = scan_export(root, catalog)
+    save_catalog(catalog)
+    published_map = published_times(job_journal.load_journal())
+    print(f"   노트 {len(notes):,}개 (새로 읽음 {read_count:,}개)")
+
+    if not notes:
+        return []
+    if len(notes) == 1:
+        return list(notes)
+
+    while True:
+        print("\n제목 검색어를 입력하세요. (Enter = 최근 수정순)")
+        print("  필터: :changed (발행 후 변경/미발행)  :unpublished  :published")
+        query = input("> ").strip()
+
+        if query.startswith(":"):
+            mode = query[1:]
+            if mode not in ("changed", "unpublished", "published"):
+                print(f"  알 수 없는 필터입니다: {query}")
+                continue
+            matched = filter_notes(notes, published_map, mode)
+            candidates = sorted(matched, key=lambda p: -matched[p]["mtime"])
+        elif query:
+            candidates = search_notes(notes, query)
+        else:
+            candidates = sorted(notes, key=lambda p: -notes[p]["mtime"])
+
+        if not candidates:
+            print("  일치하는 노트가 없습니다.")
+            continue
+
+        shown = candidates[:SEARCH_LIMIT]
+        for i, path in enumerate(shown, 1):
+            info = notes[path]
+            mark = "  (발행됨)" if path in published_map else ""
+            print(f"  [{i}] {info['title']}  — 이미지 {info['image_count']}개, "
+                  f"{info['size'] / 1024:,.0f}KB{mark}")
+        if len(candidates) > len(shown):
+            print(f"  ... 외 {len(candidates) - len(shown):,}개 (검색어를 더 구체적으로 입력하세요)")
+
+        if multiple:
+            choice = input(f"번호 선택 (쉼표로 여러 개, a = 검색된 {len(candidates):,}개 전체, Enter = 다시 검색): ").strip()
+        else:
+            choice = input("번호 선택 (Enter = 다시 검색): ").strip()
+        if not choice:
+            continue
+        if multiple and choice.lower() == "a":
+            return candidates
+
+        try:
+            nums = [int(c) for c in choice.split(",") if c.strip()]
+            selected = [shown[n - 1] for n in nums if 1 <= n <= len(shown)]
+        except ValueError:
+            selected = []
+        if not selected:
+            print(f"  1~{len(shown)} 사이의 숫자를 입력해 주세요.")
+            continue
+        return selected if multiple else selected[:1]
@@ -0,0 +1,120 @@
+"""
+티스토리 이미지 URL 맵 테스트
+==============================
+로컬 대역 페이지(editor_stub.html)에 inject_content로 본문을 넣고
+read_hosted_image_urls로 {이미지 sha256: 호스팅 URL}을 읽어오는지 확인합니다.
+
+업로더가 만든 가상환경에서 실행합니다 (헤드리스 크롬 필요):
+    .venv/bin/python -m pytest tests
+"""
+
+import os
+import sys
+import zlib
+import struct
+
+import pytest
+
+# 가상환경 밖에서 tistory_uploader를 import 하면 _bootstrap()이 설치를 시작하므로 건너뜀
+if sys.prefix == sys.base_prefix:
+    pytest.skip("업로더 가상환경(.venv)에서 실행해야 합니다.", allow_module_level=True)
+pytest.importorskip("selenium")
+pytest.importorskip("markdown")
+
+TESTS_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(TESTS_DIR))
+
+import upnote_core
+import tistory_uploader
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+
+STUB_URL = "file://" + os.path.join(TESTS_DIR, "editor_stub.html")
+STUB_URL_PREFIX = "https://blog.kakaocdn.net/dn/stub/"
+
+
+def _png(color, size=4):
+    """단색 PNG 바이트를 만듭니다."""
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data)))
+    raw = b"".join(b"\x00" + bytes(color) * size for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw))
+            + chunk(b"IEND", b""))
+
+
+@pytest.fixture(scope="module")
+def driver():
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    try:
+        drv = webdriver.Chrome(options=options)
+    except WebDriverException as e:
+        pytest.skip(f"크롬을 실행할 수 없습니다: {e.msg}")
+    yield drv
+    drv.quit()
+
+
+@pytest.fixture
+def editor(driver):
+    driver.get(STUB_URL)
+    return driver
+
+
+@pytest.fixture
+def doc(tmp_path):
+    files_dir = tmp_path / "Files"
+    files_dir.mkdir()
+    (files_dir / "red.png").write_bytes(_png((255, 0, 0)))
+    (files_dir / "blue image.png").write_bytes(_png((0, 0, 255)))
+    note = tmp_path / "note.md"
+    note.write_text(
+        "# 테스트 글\n\n첫 문단\n\n![red](Files/red.png)\n\n"
+        "둘째 문단\n\n![blue](Files/blue%20image.png)\n",
+        encoding="utf-8",
+    )
+    return upnote_core.parse_note(str(note))
+
+
+def _publish(editor, doc, image_url_map=None):
+    title, html_body = tistory_uploader.render_tistory_html(doc, image_url_map)
+    assert tistory_uploader.inject_content(editor, title, html_body)
+
+
+def _sha(doc, rel_path):
+    return doc["images"][rel_path]["sha256"]
+
+
+def test_reads_hosted_urls_in_image_order(editor, doc):
+    _publish(editor, doc)
+
+    hosted = tistory_uploader.read_hosted_image_urls(editor, doc)
+
+    assert hosted == {
+        _sha(doc, "Files/red.png"): STUB_URL_PREFIX + "image1.png",
+        _sha(doc, "Files/blue image.png"): STUB_URL_PREFIX + "image2.png",
+    }
+
+
+def test_known_images_keep_cached_url(editor, doc):
+    cached_url = "https://blog.kakaocdn.net/dn/cached/red.png"
+    _publish(editor, doc, {_sha(doc, "Files/red.png"): cached_url})
+
+    hosted = tistory_uploader.read_hosted_image_urls(editor, doc)
+
+    # 이미 올라간 이미지는 base64로 다시 보내지 않고, 새 이미지만 업로드됨
+    assert hosted == {
+        _sha(doc, "Files/red.png"): cached_url,
+        _sha(doc, "Files/blue image.png"): STUB_URL_PREFIX + "image1.png",
+    }
+
+
+def test_image_count_mismatch_records_nothing(editor, doc):
+    _publish(editor, doc)
+    editor.execute_script("window.stubEditor.dropLastImage = true;")
+
+    assert tistory_uploader.read_hosted_image_urls(editor, doc) == {}
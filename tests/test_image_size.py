@@ -0,0 +1,118 @@
+"""
+이미지 크기 헤더 파싱 테스트
+============================
+upnote_core.probe_image_size가 파일 헤더만으로 (width, height)를 읽는지 확인합니다.
+upnote_core는 표준 라이브러리만 쓰므로 가상환경 없이 실행할 수 있습니다:
+    python -m pytest tests/test_image_size.py
+"""
+
+import os
+import sys
+import zlib
+import struct
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import upnote_core
+
+
+def _png(width, height):
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data)))
+    raw = b"".join(b"\x00" + b"\x00\x00\x00" * width for _ in range(height))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw))
+            + chunk(b"IEND", b""))
+
+
+def _gif(width, height):
+    return b"GIF89a" + struct.pack("<HHBBB", width, height, 0, 0, 0) + b"\x3b"
+
+
+def _riff(chunk_type, payload):
+    chunk = chunk_type + struct.pack("<I", len(payload)) + payload
+    return b"RIFF" + struct.pack("<I", 4 + len(chunk)) + b"WEBP" + chunk
+
+
+def _webp_vp8(width, height):
+    # 프레임 태그(3) + 시작 코드(3) + 14비트 가로/세로 (위 2비트는 배율)
+    payload = b"\x30\x01\x00" + b"\x9d\x01\x2a" + struct.pack("<HH", width, height) + b"\x00" * 8
+    return _riff(b"VP8 ", payload)
+
+
+def _webp_vp8l(width, height):
+    bits = (width - 1) | ((height - 1) << 14)
+    return _riff(b"VP8L", b"\x2f" + bits.to_bytes(4, "little") + b"\x00" * 8)
+
+
+def _webp_vp8x(width, height):
+    payload = (b"\x00" * 4 + (width - 1).to_bytes(3, "little")
+               + (height - 1).to_bytes(3, "little"))
+    return _riff(b"VP8X", payload)
+
+
+def _segment(marker, data):
+    return b"\xff" + bytes([marker]) + struct.pack(">H", len(data) + 2) + data
+
+
+def _exif(orientation, endian=">"):
+    order = b"MM" if endian == ">" else b"II"
+    tiff = (order + struct.pack(endian + "HI", 42, 8)
+            + struct.pack(endian + "H", 1)
+            + struct.pack(endian + "HHIHH", 0x0112, 3, 1, orientation, 0)
+            + b"\x00" * 4)
+    return b"Exif\x00\x00" + tiff
+
+
+def _jpeg(width, height, sof=0xC0, app1=None):
+    parts = [b"\xff\xd8", _segment(0xE0, b"JFIF\x00\x01\x01\x00\x00\x01\x00\x01\x00\x00")]
+    if app1 is not None:
+        parts.append(_segment(0xE1, app1))
+    parts.append(_segment(0xDB, b"\x00" + b"\x01" * 64))
+    parts.append(_segment(sof, struct.pack(">BHHB", 8, height, width, 1) + b"\x01\x11\x00"))
+    parts.append(b"\xff\xd9")
+    return b"".join(parts)
+
+
+@pytest.mark.parametrize("name, data, size", [
+    ("image.png", _png(31, 17), (31, 17)),
+    ("image.gif", _gif(640, 480), (640, 480)),
+    ("vp8.webp", _webp_vp8(300, 200), (300, 200)),
+    ("vp8l.webp", _webp_vp8l(1024, 768), (1024, 768)),
+    ("vp8x.webp", _webp_vp8x(4000, 3000), (4000, 3000)),
+    ("baseline.jpg", _jpeg(1920, 1080, sof=0xC0), (1920, 1080)),
+    ("progressive.jpg", _jpeg(1920, 1080, sof=0xC2), (1920, 1080)),
+])
+def test_probe_image_size(tmp_path, name, data, size):
+    path = tmp_path / name
+    path.write_bytes(data)
+    assert upnote_core.probe_image_size(str(path)) == size
+
+
+@pytest.mark.parametrize("orientation, size", [
+    (1, (4032, 3024)), (3, (4032, 3024)),
+    (5, (3024, 4032)), (6, (3024, 4032)), (7, (3024, 4032)), (8, (3024, 4032)),
+])
+@pytest.mark.parametrize("endian", [">", "<"])
+def test_rotated_jpeg_reports_displayed_size(tmp_path, orientation, size, endian):
+    path = tmp_path / "photo.jpg"
+    path.write_bytes(_jpeg(4032, 3024, app1=_exif(orientation, endian)))
+    assert upnote_core.probe_image_size(str(path)) == size
+
+
+def test_malformed_exif_keeps_sof_size(tmp_path):
+    # IFD 오프셋이 데이터 끝을 넘어가는 Exif
+    broken = b"Exif\x00\x00MM" + struct.pack(">HI", 42, 0xFFFF)
+    path = tmp_path / "broken.jpg"
+    path.write_bytes(_jpeg(800, 600, app1=broken))
+    assert upnote_core.probe_image_size(str(path)) == (800, 600)
+
+
+def test_unknown_format_returns_none(tmp_path):
+    path = tmp_path / "note.bin"
+    path.write_bytes(b"not an image at all" * 4)
+    assert upnote_core.probe_image_size(str(path)) is None
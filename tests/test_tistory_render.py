@@ -0,0 +1,90 @@
+"""
+티스토리 HTML 변환 테스트
+=========================
+저메모리 변환(render_tistory_html_to_file)이 일반 변환(render_tistory_html)과
+바이트 단위로 같은 HTML을 만드는지 확인합니다.
+
+업로더가 만든 가상환경에서 실행합니다:
+    .venv/bin/python -m pytest tests
+"""
+
+import os
+import sys
+import zlib
+import struct
+
+import pytest
+
+# 가상환경 밖에서 tistory_uploader를 import 하면 _bootstrap()이 설치를 시작하므로 건너뜀
+if sys.prefix == sys.base_prefix:
+    pytest.skip("업로더 가상환경(.venv)에서 실행해야 합니다.", allow_module_level=True)
+pytest.importorskip("selenium")
+pytest.importorskip("markdown")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import upnote_core
+import tistory_uploader
+
+
+def _png(color, size=8):
+    def chunk(kind, data):
+        return (struct.pack(">I", len(data)) + kind + data
+                + struct.pack(">I", zlib.crc32(kind + data)))
+    raw = b"".join(b"\x00" + bytes(color) * size for _ in range(size))
+    return (b"\x89PNG\r\n\x1a\n"
+            + chunk(b"IHDR", struct.pack(">IIBBBBB", size, size, 8, 2, 0, 0, 0))
+            + chunk(b"IDAT", zlib.compress(raw))
+            + chunk(b"IEND", b""))
+
+
+NOTES = {
+    "plain": "# 제목\n\n첫 문단\n\n![red](Files/red.png)\n\n| a | b |\n|---|---|\n| ![blue](Files/blue.png) | x |\n",
+    "fenced_code": "# 제목\n\n```bash\n# 이미지 예시\n![red](Files/red.png)\n```\n\n![blue](Files/blue.png)\n",
+    "fenced_code_with_lang_html": "```html\n<p>![red](Files/red.png)</p>\n```\n",
+    "inline_code": "문법은 `![blue](Files/blue.png)` 이렇게 씁니다.\n\n![red](Files/red.png)\n",
+    "missing_image": "![없음](Files/missing.png)\n\n![red](Files/red.png)\n",
+}
+
+
+@pytest.fixture
+def make_doc(tmp_path):
+    files_dir = tmp_path / "Files"
+    files_dir.mkdir()
+    (files_dir / "red.png").write_bytes(_png((255, 0, 0)))
+    (files_dir / "blue.png").write_bytes(_png((0, 0, 255)))
+
+    def make(text):
+        note = tmp_path / "note.md"
+        note.write_text(text, encoding="utf-8")
+        return upnote_core.parse_note(str(note))
+    return make
+
+
+def _render_both(doc, image_url_map=None):
+    title, html_body = tistory_uploader.render_tistory_html(doc, image_url_map)
+    file_title, html_file = tistory_uploader.render_tistory_html_to_file(doc, image_url_map)
+    with html_file:
+        file_body = html_file.read().decode("utf-8")
+    assert file_title == title
+    return html_body, file_body
+
+
+@pytest.mark.parametrize("name", sorted(NOTES))
+def test_low_memory_output_matches(make_doc, name):
+    html_body, file_body = _render_both(make_doc(NOTES[name]))
+    assert file_body == html_body
+
+
+@pytest.mark.parametrize("name", sorted(NOTES))
+def test_low_memory_output_matches_with_hosted_urls(make_doc, name):
+    doc = make_doc(NOTES[name])
+    image_url_map = {doc["images"]["Files/red.png"]["sha256"]: "https://blog.kakaocdn.net/dn/a/red.png"}
+    html_body, file_body = _render_both(doc, image_url_map)
+    assert file_body == html_body
+
+
+def test_image_in_code_stays_escaped(make_doc):
+    _, file_body = _render_both(make_doc(NOTES["fenced_code"]))
+    code = tistory_uploader.CODE_TAG_PATTERN.search(file_body).group(0)
+    assert "<img" not in code
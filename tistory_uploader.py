@@ -64,10 +64,16 @@ _bootstrap()
 # ──────────────────────────────────────────────
 import re
 import glob
+import html
+import json
+import mmap
 import time
 import base64
 import shutil
-import urllib.parse
+import secrets
+import tempfile
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
 
 import markdown
 from selenium import webdriver
@@ -75,59 +81,195 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
+import upnote_core
+import job_journal
+import note_catalog
+
 
 # ─────────────────────────────────────────────
 # 1. 마크다운 → HTML 변환 (이미지 base64 인라인)
 # ─────────────────────────────────────────────
-def convert_md_to_html_with_images(md_file_path):
-    """마크다운 파일을 읽고, 이미지를 base64로 인라인 임베딩한 HTML을 반환합니다."""
+MARKDOWN_EXTENSIONS = ["fenced_code", "tables", "codehilite", "nl2br"]
 
-    md_dir = os.path.dirname(md_file_path)
 
-    with open(md_file_path, "r", encoding="utf-8") as f:
-        md_text = f.read()
+def _image_html(block, image_url_map):
+    """이미지 블록을 <img> 태그로 만듭니다 (호스팅된 URL 또는 base64 data URI)."""
+    image = block["image"]
+    hosted_url = image_url_map.get(image["sha256"])
+    if hosted_url:
+        print(f"  ✓ 이미지 URL 재사용: {image['rel_path']}")
+        return (f'<img src="{html.escape(hosted_url)}" alt="{block["alt"]}" '
+                f'{upnote_core.image_attrs(image)} />')
 
-    # 제목 추출: 파일 이름에서 .md 제거
-    title = os.path.basename(md_file_path).replace(".md", "")
+    with open(image["abs_path"], "rb") as img_f:
+        b64 = base64.b64encode(img_f.read()).decode("utf-8")
 
-    # 이미지 참조를 base64 data URI로 치환
-    def replace_image(match):
-        alt_text = match.group(1)
-        img_path_raw = match.group(2)
-        # URL 인코딩된 경로 디코딩 (예: image%202.png → image 2.png)
-        img_path_decoded = urllib.parse.unquote(img_path_raw)
-        abs_img_path = os.path.join(md_dir, img_path_decoded)
+    print(f"  ✓ 이미지 임베딩: {image['rel_path']}")
+    return (f'<img src="data:{image["mime"]};base64,{b64}" alt="{block["alt"]}" '
+            f'{upnote_core.image_attrs(image)} />')
 
-        if os.path.exists(abs_img_path):
-            ext = os.path.splitext(abs_img_path)[1].lower()
-            mime_map = {".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
-                        ".gif": "image/gif", ".webp": "image/webp", ".svg": "image/svg+xml"}
-            mime = mime_map.get(ext, "image/png")
 
-            with open(abs_img_path, "rb") as img_f:
-                b64 = base64.b64encode(img_f.read()).decode("utf-8")
+def render_tistory_html(doc, image_url_map=None):
+    """중간 문서(upnote_core.parse_note)를 이미지가 base64로 인라인된 HTML로 변환합니다.
 
-            print(f"  ✓ 이미지 임베딩: {img_path_decoded}")
-            return f'<img src="data:{mime};base64,{b64}" alt="{alt_text}" />'
-        else:
-            print(f"  ✗ 이미지 없음 (건너뜀): {img_path_decoded}")
-            return match.group(0)  # 원본 유지
+    image_url_map({sha256: URL})이 주어지면 이미 티스토리에 올라간 이미지는
+    base64 대신 호스팅된 URL을 사용합니다.
+    """
+    image_url_map = image_url_map or {}
+
+    # 이미지 블록을 base64 data URI(또는 호스팅된 URL)로 치환
+    def replace_image(block):
+        image = block["image"]
+        if not image["exists"]:
+            print(f"  ✗ 이미지 없음 (건너뜀): {image['rel_path']}")
+            return block["source"]  # 원본 유지
+        return _image_html(block, image_url_map)
 
-    # Markdown 이미지 구문: ![alt](path)
-    md_text = re.sub(r'!\[([^\]]*)\]\(([^)]+)\)', replace_image, md_text)
+    md_text = upnote_core.render_blocks(doc, replace_image)
 
     # Markdown → HTML 변환
-    html_body = markdown.markdown(
-        md_text,
-        extensions=["fenced_code", "tables", "codehilite", "nl2br"],
-    )
+    html_body = markdown.markdown(md_text, extensions=MARKDOWN_EXTENSIONS)
+
+    return doc["title"], html_body
+
+
+# 저메모리 모드: 이미지 합계가 이 크기를 넘으면 HTML을 디스크에서 조립합니다
+LOW_MEMORY_THRESHOLD = 32 * 1024 * 1024
+MEMORY_BUDGET_MB = 64
+SPOOL_MAX_SIZE = 8 * 1024 * 1024      # 이보다 커지면 임시 파일(디스크)로 넘어감
+B64_CHUNK_SIZE = 3 * 256 * 1024       # 3의 배수여야 청크별 base64를 이어 붙일 수 있음
+
+
+def _write_base64(out, path):
+    """이미지 파일을 mmap으로 열어 청크 단위로 base64 인코딩하여 out에 씁니다."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for start in range(0, len(mm), B64_CHUNK_SIZE):
+                out.write(base64.b64encode(mm[start:start + B64_CHUNK_SIZE]))
 
-    return title, html_body
+
+def needs_low_memory(doc):
+    """이미지 합계가 LOW_MEMORY_THRESHOLD를 넘어 저메모리 모드로 변환해야 하는지 확인합니다."""
+    return sum(image["size"] for image in doc["images"].values()) > LOW_MEMORY_THRESHOLD
+
+
+def prompt_memory_options():
+    """저메모리 모드 사용 여부와 메모리 예산(MB)을 입력받습니다.
+    (low_memory, memory_budget_mb)를 반환하며, low_memory가 None이면 노트 크기로 자동 결정합니다."""
+    threshold_mb = LOW_MEMORY_THRESHOLD // (1024 * 1024)
+    print(f"\n저메모리 모드 (Enter = 자동: 이미지 합계 {threshold_mb}MB 초과 시, y = 항상, n = 사용 안 함)")
+    answer = input("> ").strip().lower()
+    low_memory = {"y": True, "yes": True, "n": False, "no": False}.get(answer)
+
+    memory_budget_mb = MEMORY_BUDGET_MB
+    if low_memory is not False:
+        budget_input = input(f"메모리 예산 MB (Enter = {MEMORY_BUDGET_MB}): ").strip()
+        if budget_input.isdigit() and int(budget_input) > 0:
+            memory_budget_mb = int(budget_input)
+    return low_memory, memory_budget_mb
+
+
+def report_peak_memory(label, peak, memory_budget_mb):
+    """tracemalloc으로 잰 피크 메모리(bytes)를 예산과 비교해 출력합니다."""
+    peak_mb = peak / (1024 * 1024)
+    if peak_mb > memory_budget_mb:
+        print(f"   ⚠ {label} 피크 메모리 {peak_mb:,.1f}MB — 예산 {memory_budget_mb}MB 초과")
+    else:
+        print(f"   {label} 피크 메모리 {peak_mb:,.1f}MB (예산 {memory_budget_mb}MB)")
+
+
+# 코드 영역 (<code>...</code>, codehilite의 <pre> 포함)
+CODE_TAG_PATTERN = re.compile(r"<(pre|code)\b[^>]*>.*?</\1>", re.DOTALL | re.IGNORECASE)
+
+
+def render_tistory_html_to_file(doc, image_url_map=None, out=None):
+    """render_tistory_html의 저메모리 버전. (title, 파일 객체)를 반환합니다.
+
+    마크다운 변환은 이미지 자리표시자만 넣은 본문으로 하고,
+    최종 HTML은 임시 파일(SpooledTemporaryFile)에 조각조각 써서 조립합니다.
+    out에 바이너리 모드 파일을 넘기면 그 파일에 씁니다.
+    이미지는 mmap에서 청크 단위로 base64 인코딩하므로 한 번에 메모리에 올리지 않습니다.
+
+    코드 블록/인라인 코드 안의 이미지 구문은 render_tistory_html처럼 이스케이프된
+    텍스트로 보여야 하므로, 그런 이미지만 자리표시자 없이 본문에 넣어 다시 변환합니다.
+    """
+    image_url_map = image_url_map or {}
+    token = secrets.token_hex(4)
+    placeholder_pattern = re.compile(rf"UPNOTEIMG{token}N(\d+)X")
+    image_blocks = []
+
+    for block in doc["blocks"]:
+        if block["type"] == "image" and not block["image"]["exists"]:
+            print(f"  ✗ 이미지 없음 (건너뜀): {block['image']['rel_path']}")
+
+    def render(inline):
+        """inline에 든 번호의 이미지는 <img>로, 나머지는 자리표시자로 넣어 변환합니다."""
+        image_blocks.clear()
+
+        def placeholder(block):
+            if not block["image"]["exists"]:
+                return block["source"]  # 원본 유지
+            image_blocks.append(block)
+            index = len(image_blocks) - 1
+            if index in inline:
+                return _image_html(block, image_url_map)
+            return f"UPNOTEIMG{token}N{index}X"
+
+        return markdown.markdown(upnote_core.render_blocks(doc, placeholder),
+                                 extensions=MARKDOWN_EXTENSIONS)
+
+    html_text = render(set())
+
+    # 코드 밖에서 온전히 남은 자리표시자만 나중에 치환한다.
+    # 코드 안에 들어간 것(하이라이트로 쪼개진 것 포함)은 본문에 직접 넣어 다시 변환
+    outside_code = CODE_TAG_PATTERN.sub("", html_text)
+    found = {int(i) for i in placeholder_pattern.findall(outside_code)}
+    in_code = set(range(len(image_blocks))) - found
+    if in_code:
+        html_text = render(in_code)
+
+    if out is None:
+        out = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    pos = 0
+    for match in placeholder_pattern.finditer(html_text):
+        out.write(html_text[pos:match.start()].encode("utf-8"))
+        pos = match.end()
+
+        block = image_blocks[int(match.group(1))]
+        image = block["image"]
+        attrs = f'alt="{block["alt"]}" {upnote_core.image_attrs(image)}'
+
+        hosted_url = image_url_map.get(image["sha256"])
+        if hosted_url:
+            print(f"  ✓ 이미지 URL 재사용: {image['rel_path']}")
+            out.write(f'<img src="{html.escape(hosted_url)}" {attrs} />'.encode("utf-8"))
+            continue
+
+        out.write(f'<img src="data:{image["mime"]};base64,'.encode("utf-8"))
+        _write_base64(out, image["abs_path"])
+        out.write(f'" {attrs} />'.encode("utf-8"))
+        print(f"  ✓ 이미지 임베딩: {image['rel_path']}")
+    out.write(html_text[pos:].encode("utf-8"))
+
+    out.seek(0)
+    return doc["title"], out
+
+
+def convert_md_to_html_with_images(md_file_path):
+    """마크다운 파일을 읽고, 이미지를 base64로 인라인 임베딩한 HTML을 반환합니다."""
+    return render_tistory_html(upnote_core.parse_note(md_file_path))
 
 
 # ─────────────────────────────────────────────
 # 2. 크롬 브라우저 실행 (프로필 자동 관리)
 # ─────────────────────────────────────────────
+class ChromeLaunchError(RuntimeError):
+    """크롬을 시작할 수 없을 때 발생합니다.
+    백그라운드 스레드에서 실행되므로 sys.exit 대신 예외로 호출한 쪽에 알립니다."""
+
+
 def launch_chrome():
     """Selenium 크롬 드라이버를 실행합니다. 프로필 잠금 자동 정리 포함."""
 
@@ -161,14 +303,14 @@ def launch_chrome():
         except Exception as e:
             print(f"\n[에러] 크롬을 시작할 수 없습니다: {e}")
             print("모든 크롬 창을 닫고 다시 시도해 주세요.")
-            sys.exit(1)
+            raise ChromeLaunchError(f"크롬을 시작할 수 없습니다: {e}") from e
 
 
 # ─────────────────────────────────────────────
 # 3. 티스토리 에디터에 JavaScript로 콘텐츠 주입
 # ─────────────────────────────────────────────
-def inject_content(driver, title, html_body):
-    """JavaScript를 사용하여 TinyMCE 에디터에 제목과 본문을 직접 주입합니다."""
+def inject_title(driver, title):
+    """제목 textarea에 제목을 입력합니다."""
 
     wait = WebDriverWait(driver, 20)
 
@@ -202,6 +344,12 @@ def inject_content(driver, title, html_body):
     """)
     print(f"   ✓ 제목: {title}")
 
+
+def inject_content(driver, title, html_body):
+    """JavaScript를 사용하여 TinyMCE 에디터에 제목과 본문을 직접 주입합니다."""
+
+    inject_title(driver, title)
+
     # 본문 입력 (TinyMCE API 직접 호출)
     print(">> 본문 입력 중...")
 
@@ -265,8 +413,299 @@ def inject_content(driver, title, html_body):
         return fallback_success in ("codemirror_ok",)
 
 
+INJECT_CHUNK_SIZE = 1024 * 1024
+
+def inject_content_chunked(driver, title, html_file):
+    """inject_content의 저메모리 버전. 파일의 HTML을 청크 단위로 브라우저에 보낸 뒤 주입합니다.
+    Python 쪽에는 한 번에 청크 하나만 올라갑니다."""
+
+    inject_title(driver, title)
+
+    print(">> 본문 입력 중... (분할 전송)")
+    driver.execute_script("""
+        window.__upnoteDecoder = new TextDecoder('utf-8');
+        window.__upnoteHtml = '';
+    """)
+    sent = 0
+    while True:
+        chunk = html_file.read(INJECT_CHUNK_SIZE)
+        if not chunk:
+            break
+        # 청크 경계에서 잘린 UTF-8 문자는 TextDecoder stream 모드가 이어 붙임
+        driver.execute_script("""
+            var binStr = atob(arguments[0]);
+            var bytes = new Uint8Array(binStr.length);
+            for (var i = 0; i < binStr.length; i++) {
+                bytes[i] = binStr.charCodeAt(i);
+            }
+            window.__upnoteHtml += window.__upnoteDecoder.decode(bytes, {stream: true});
+        """, base64.b64encode(chunk).decode("ascii"))
+        sent += len(chunk)
+    print(f"   전송: {sent:,} bytes")
+
+    result = driver.execute_script("""
+        try {
+            var htmlContent = window.__upnoteHtml + window.__upnoteDecoder.decode();
+            delete window.__upnoteHtml;
+            delete window.__upnoteDecoder;
+
+            if (typeof tinymce !== 'undefined' && tinymce.activeEditor) {
+                tinymce.activeEditor.setContent(htmlContent);
+                return 'tinymce_ok';
+            }
+
+            // 대체: HTML 모드의 CodeMirror에 주입
+            var htmlContainer = document.getElementById('html-editor-container');
+            if (htmlContainer) {
+                htmlContainer.style.display = 'block';
+            }
+            var cmElements = document.querySelectorAll('.CodeMirror');
+            for (var i = 0; i < cmElements.length; i++) {
+                var cm = cmElements[i].CodeMirror;
+                if (cm) {
+                    cm.setValue(htmlContent);
+                    return 'codemirror_ok';
+                }
+            }
+            return 'not_found';
+        } catch(e) {
+            return 'error: ' + e.message;
+        }
+    """)
+
+    if result == "tinymce_ok":
+        print("   ✓ 본문 (TinyMCE에 직접 주입 완료)")
+    elif result == "codemirror_ok":
+        print("   ✓ 본문 (HTML 모드 CodeMirror에 주입 완료)")
+    else:
+        print(f"   ⚠ 본문 주입 실패 ({result})")
+    return result in ("tinymce_ok", "codemirror_ok")
+
+
+# ─────────────────────────────────────────────
+# 4. 업로드된 이미지 URL 재사용 (이미지 해시 → URL)
+# ─────────────────────────────────────────────
+IMAGE_URL_MAP_PATH = os.path.join(os.path.expanduser("~"), ".tistory_image_urls.json")
+
+IMG_SRC_PATTERN = re.compile(r"<img\b[^>]*?\bsrc=[\"']([^\"']*)[\"']", re.IGNORECASE)
+
+
+def load_image_url_map(path=IMAGE_URL_MAP_PATH):
+    """저장된 이미지 URL 맵({sha256: URL})을 불러옵니다."""
+    if os.path.exists(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_image_url_map(url_map, path=IMAGE_URL_MAP_PATH):
+    """이미지 URL 맵을 파일에 저장합니다."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(url_map, f, ensure_ascii=False, indent=2)
+
+
+def match_hosted_image_urls(doc, content_html):
+    """에디터 본문 HTML의 <img src>를 노트의 이미지 블록과 짝지어 {sha256: URL}을 반환합니다.
+
+    <img> 태그는 render_tistory_html이 만든 순서 그대로이므로 순서대로 짝을 맞춥니다.
+    개수가 다르면(편집으로 이미지가 바뀐 경우) 아무것도 기록하지 않습니다.
+    data URI로 남아 있는 이미지는 기록하지 않습니다.
+    """
+    srcs = [html.unescape(src) for src in IMG_SRC_PATTERN.findall(content_html)]
+    image_blocks = [b for b in doc["blocks"] if b["type"] == "image"]
+    if len(srcs) != len(image_blocks):
+        print(f"   ⚠ 이미지 개수가 다릅니다 (노트 {len(image_blocks)}개, 에디터 {len(srcs)}개) → 기록 생략")
+        return {}
+
+    hosted = {}
+    for block, src in zip(image_blocks, srcs):
+        sha = block["image"]["sha256"]
+        if sha and src.startswith(("http://", "https://", "//")):
+            hosted[sha] = src
+    return hosted
+
+
+def read_hosted_image_urls(driver, doc):
+    """에디터 본문(tinymce getContent)에서 티스토리가 바꿔 쓴 이미지 URL을 읽어옵니다."""
+    content = driver.execute_script("""
+        if (typeof tinymce !== 'undefined' && tinymce.activeEditor) {
+            return tinymce.activeEditor.getContent();
+        }
+        return null;
+    """)
+    if not content:
+        print("   ⚠ 에디터 본문을 읽을 수 없습니다.")
+        return {}
+    return match_hosted_image_urls(doc, content)
+
+
+# ─────────────────────────────────────────────
+# 5. 발행 (크롬 실행 ∥ 변환 → 주입)
+# ─────────────────────────────────────────────
+def open_write_page(blog_id, driver=None):
+    """크롬을 실행하고 글쓰기 페이지로 이동한 드라이버를 반환합니다.
+    driver가 주어지면 새로 실행하지 않고 그 창에서 이동합니다 (여러 글 연속 발행)."""
+    if driver is None:
+        driver = launch_chrome()
+
+    write_url = f"https://{blog_id}.tistory.com/manage/post"
+    print(f">> 글쓰기 페이지 이동: {write_url}")
+    driver.get(write_url)
+    time.sleep(3)
+    return driver
+
+
+def start_write_page(blog_id, driver=None):
+    """open_write_page를 백그라운드 스레드에서 시작하고 Future를 반환합니다.
+
+    크롬 실행/페이지 로딩과 마크다운 변환은 서로 독립적이므로
+    블로그 ID가 정해지는 즉시 시작해 두면 변환과 동시에 진행됩니다.
+    """
+    print(">> 크롬 브라우저 실행 (백그라운드)")
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(open_write_page, blog_id, driver)
+    executor.shutdown(wait=False)
+    return future
+
+
+def publish_to_tistory(doc, blog_id, image_url_map=None, write_page=None,
+                       rendered=None, on_state=None, low_memory=None,
+                       memory_budget_mb=MEMORY_BUDGET_MB, reused=False):
+    """중간 문서를 티스토리 글쓰기 에디터에 주입합니다. 성공 여부를 반환합니다.
+
+    image_url_map이 주어지면 알려진 이미지는 호스팅된 URL로 넣고,
+    저장 후 에디터에서 새로 바뀐 이미지 URL을 읽어 맵과 파일에 기록합니다.
+    write_page는 start_write_page가 돌려준 Future로, 없으면 여기서 시작합니다.
+    rendered에 미리 변환한 결과 (title, html_body)를 넘기면 변환을 건너뜁니다.
+    html_body 대신 바이너리 모드 HTML 파일 객체를 넘기면 분할 주입하고 끝나면 닫습니다.
+    reused는 rendered가 저널에 저장된 이전 변환 결과일 때 True (안내 문구용)입니다.
+    on_state(state, **info)는 converted / injected / saved 단계마다 호출됩니다 (작업 저널용).
+    low_memory가 None이면 이미지 합계가 LOW_MEMORY_THRESHOLD를 넘을 때 저메모리 모드로
+    변환/주입하고, 피크 메모리(tracemalloc)를 memory_budget_mb와 비교해 보고합니다.
+    """
+    if write_page is None:
+        write_page = start_write_page(blog_id)
+
+    # 이전 변환 결과가 파일(저메모리 변환)이면 그대로 분할 주입
+    html_file = None
+    if rendered is not None and not isinstance(rendered[1], str):
+        html_file = rendered[1]
+
+    if low_memory is None:
+        low_memory = needs_low_memory(doc)
+    low_memory = low_memory and (rendered is None or html_file is not None)
+    if low_memory:
+        tracemalloc.start()
+
+    # Enter 대기 중 Ctrl-C 등으로 중단되어도 메모리 추적과 임시 파일은 정리
+    try:
+        # Step 1: 마크다운 → HTML 변환 (크롬 실행과 동시에 진행)
+        print(f"\n{'─'*55}")
+        print("[ Step 1/3 ] 마크다운 → HTML 변환 + 이미지 임베딩")
+        print(f"{'─'*55}")
+        if html_file is not None:
+            title = rendered[0]
+            if reused:
+                print("   (이전 변환 결과 재사용)")
+            print("   (저메모리 모드: 파일에서 분할 주입)")
+            html_file.seek(0, os.SEEK_END)
+            print(f"\n   변환 완료! (HTML 크기: {html_file.tell():,} bytes)")
+            html_file.seek(0)
+        elif rendered is not None:
+            title, html_body = rendered
+            if reused:
+                print("   (이전 변환 결과 재사용)")
+            print(f"\n   변환 완료! (HTML 길이: {len(html_body):,}자)")
+        elif low_memory:
+            print("   (저메모리 모드: HTML을 임시 파일에서 조립)")
+            title, html_file = render_tistory_html_to_file(doc, image_url_map)
+            if on_state:
+                on_state("converted", title=title)
+            html_file.seek(0, os.SEEK_END)
+            print(f"\n   변환 완료! (HTML 크기: {html_file.tell():,} bytes)")
+            html_file.seek(0)
+        else:
+            title, html_body = render_tistory_html(doc, image_url_map)
+            if on_state:
+                on_state("converted", title=title, html_body=html_body)
+            print(f"\n   변환 완료! (HTML 길이: {len(html_body):,}자)")
+
+        # Step 2: 크롬 실행 & 에디터 열기 (백그라운드 작업 합류)
+        print(f"\n{'─'*55}")
+        print("[ Step 2/3 ] 크롬 브라우저 실행")
+        print(f"{'─'*55}")
+        driver = write_page.result()
+
+        print(f"\n{'='*55}")
+        print("브라우저에서 글쓰기 에디터 화면이 보일 때까지 기다려 주세요!")
+        print("")
+        print("  • 로그인 화면이면 → 로그인 먼저!")
+        print("  • 에디터(제목 + 본문)가 보이면 → 터미널에서 Enter!")
+        print(f"{'='*55}\n")
+        input("👉 에디터가 완전히 로딩되면 Enter를 누르세요... ")
+
+        # Alert 처리
+        try:
+            while True:
+                alert = driver.switch_to.alert
+                print(f">> 알림창 처리: '{alert.text}'")
+                alert.dismiss()
+                time.sleep(0.5)
+        except:
+            pass
+
+        # Step 3: 콘텐츠 주입
+        print(f"\n{'─'*55}")
+        print("[ Step 3/3 ] 제목 + 본문 자동 입력 (JavaScript 주입)")
+        print(f"{'─'*55}")
+
+        if html_file is not None:
+            with html_file:
+                success = inject_content_chunked(driver, title, html_file)
+        else:
+            success = inject_content(driver, title, html_body)
+        if low_memory:
+            _, peak = tracemalloc.get_traced_memory()
+            report_peak_memory("변환/주입" if rendered is None else "주입", peak, memory_budget_mb)
+        if success and on_state:
+            on_state("injected")
+
+        print(f"\n{'='*55}")
+        if success:
+            print("🎉 모든 작업이 완료되었습니다!")
+            print("")
+            print("  브라우저에서 내용을 확인하신 후")
+            print("  우측 하단의 [완료] 버튼을 눌러 발행해 주세요!")
+        else:
+            print("⚠ 일부 자동 입력에 실패했습니다.")
+            print("  브라우저에서 직접 확인 및 수정해 주세요.")
+        print(f"{'='*55}\n")
+
+        # 저장 확인 (+ 호스팅된 이미지 URL 기록)
+        record_urls = image_url_map is not None and doc["images"]
+        if success and (record_urls or on_state):
+            print("[임시저장] 또는 발행 후, 에디터 화면에서 Enter를 누르세요.")
+            answer = input("👉 (건너뛰려면 n 입력) ").strip().lower()
+            if answer not in ("n", "no"):
+                if record_urls:
+                    hosted = read_hosted_image_urls(driver, doc)
+                    new_count = len(set(hosted) - set(image_url_map))
+                    image_url_map.update(hosted)
+                    save_image_url_map(image_url_map)
+                    print(f"   ✓ 이미지 URL {len(hosted)}개 기록 (새로 {new_count}개)")
+                if on_state:
+                    on_state("saved")
+
+        return success
+    finally:
+        if html_file is not None:
+            html_file.close()
+        if low_memory:
+            tracemalloc.stop()
+
+
 # ─────────────────────────────────────────────
-# 4. 메인 실행
+# 6. 메인 실행
 # ─────────────────────────────────────────────
 def main():
     print("=" * 55)
@@ -285,20 +724,12 @@ def main():
         print(f"[에러] 폴더를 찾을 수 없습니다: {target_dir}")
         return
 
-    # .md 파일 찾기
-    md_files = glob.glob(os.path.join(target_dir, "*.md"))
+    # 노트 선택 (하위 폴더 포함 카탈로그에서 검색/필터)
+    md_files = note_catalog.pick_notes(target_dir)
     if not md_files:
         print(f"[에러] 해당 폴더에 .md 파일이 없습니다: {target_dir}")
         return
-
-    if len(md_files) == 1:
-        md_file = md_files[0]
-    else:
-        print(f"\n{len(md_files)}개의 .md 파일이 있습니다:")
-        for i, f in enumerate(md_files):
-            print(f"  [{i+1}] {os.path.basename(f)}")
-        choice = input("번호 선택: ").strip()
-        md_file = md_files[int(choice) - 1]
+    md_file = md_files[0]
 
     print(f"\n>> 대상 파일: {os.path.basename(md_file)}")
 
@@ -309,59 +740,33 @@ def main():
         print("[에러] 블로그 ID가 필요합니다.")
         return
 
-    # Step 1: 마크다운 → HTML 변환
-    print(f"\n{'─'*55}")
-    print("[ Step 1/3 ] 마크다운 → HTML 변환 + 이미지 임베딩")
-    print(f"{'─'*55}")
-    title, html_body = convert_md_to_html_with_images(md_file)
-    print(f"\n   변환 완료! (HTML 길이: {len(html_body):,}자)")
+    # 크롬 실행/글쓰기 페이지 이동은 변환과 동시에 진행
+    write_page = start_write_page(blog_id)
 
-    # Step 2: 크롬 실행 & 에디터 열기
-    print(f"\n{'─'*55}")
-    print("[ Step 2/3 ] 크롬 브라우저 실행")
-    print(f"{'─'*55}")
-    driver = launch_chrome()
+    # 이미 업로드된 이미지 URL 재사용 여부
+    image_url_map = None
+    reuse = input("\n업로드된 이미지 URL을 재사용할까요? (Y/n): ").strip().lower()
+    if reuse in ("", "y", "yes"):
+        image_url_map = load_image_url_map()
+        print(f"   저장된 이미지 URL: {len(image_url_map)}개")
 
-    write_url = f"https://{blog_id}.tistory.com/manage/post"
-    print(f">> 글쓰기 페이지 이동: {write_url}")
-    driver.get(write_url)
-    time.sleep(3)
+    low_memory, memory_budget_mb = prompt_memory_options()
+
+    doc = upnote_core.parse_note(md_file)
+
+    # 발행 상태를 작업 저널에 기록 (카탈로그의 "발행 후 변경" 필터에 사용)
+    journal = job_journal.load_journal()
+    note = os.path.abspath(md_file)
 
-    print(f"\n{'='*55}")
-    print("브라우저에서 글쓰기 에디터 화면이 보일 때까지 기다려 주세요!")
-    print("")
-    print("  • 로그인 화면이면 → 로그인 먼저!")
-    print("  • 에디터(제목 + 본문)가 보이면 → 터미널에서 Enter!")
-    print(f"{'='*55}\n")
-    input("👉 에디터가 완전히 로딩되면 Enter를 누르세요... ")
+    def on_state(state, **info):
+        job_journal.record(journal, note, "tistory", state,
+                           source_hash=job_journal.note_fingerprint(doc))
 
-    # Alert 처리
     try:
-        while True:
-            alert = driver.switch_to.alert
-            print(f">> 알림창 처리: '{alert.text}'")
-            alert.dismiss()
-            time.sleep(0.5)
-    except:
-        pass
-
-    # Step 3: 콘텐츠 주입
-    print(f"\n{'─'*55}")
-    print("[ Step 3/3 ] 제목 + 본문 자동 입력 (JavaScript 주입)")
-    print(f"{'─'*55}")
-
-    success = inject_content(driver, title, html_body)
-
-    print(f"\n{'='*55}")
-    if success:
-        print("🎉 모든 작업이 완료되었습니다!")
-        print("")
-        print("  브라우저에서 내용을 확인하신 후")
-        print("  우측 하단의 [완료] 버튼을 눌러 발행해 주세요!")
-    else:
-        print("⚠ 일부 자동 입력에 실패했습니다.")
-        print("  브라우저에서 직접 확인 및 수정해 주세요.")
-    print(f"{'='*55}\n")
+        publish_to_tistory(doc, blog_id, image_url_map, write_page, on_state=on_state,
+                           low_memory=low_memory, memory_budget_mb=memory_budget_mb)
+    except ChromeLaunchError:
+        sys.exit(1)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,272 @@
+"""
+UpNote 노트 공통 변환 코어
+==========================
+UpNote에서 내보낸 마크다운(.md) 파일을 한 번만 읽어서
+티스토리/GitHub Pages 업로더가 함께 사용하는 중간 문서(dict)로 만듭니다.
+
+중간 문서 구조:
+    {
+        "source_path": 원본 .md 경로,
+        "source_dir":  원본 폴더,
+        "sha256":      원본 .md 내용 해시,
+        "title":       제목 (문서 맨 앞의 '# 제목' 또는 파일 이름),
+        "blocks":      [{"type": "text", "text": ...},
+                        {"type": "image", "alt": ..., "raw_path": ..., "image": 이미지 참조}],
+        "images":      {상대경로: 이미지 참조},
+    }
+
+이미지 참조 구조:
+    {
+        "raw_path": 마크다운에 적힌 경로 (URL 인코딩 그대로),
+        "rel_path": 디코딩된 상대 경로,
+        "abs_path": 실제 파일 경로,
+        "exists":   파일 존재 여부,
+        "size":     파일 크기 (bytes),
+        "sha256":   파일 내용 해시,
+        "mime":     MIME 타입,
+    }
+
+표준 라이브러리만 사용하므로 어느 업로더에서든 import 할 수 있습니다.
+"""
+
+import os
+import re
+import struct
+import hashlib
+import urllib.parse
+
+
+# Markdown 이미지 구문: ![alt](path)
+IMAGE_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+
+# 문서 맨 앞(빈 줄은 허용)의 H1 제목: # 제목
+# 본문 중간의 '# ...' (코드 블록 안의 셸 주석 등)은 제목으로 보지 않는다
+TITLE_PATTERN = re.compile(r"\A\s*#[ \t]+(.+)$", re.MULTILINE)
+
+MIME_MAP = {
+    ".png": "image/png", ".jpg": "image/jpeg", ".jpeg": "image/jpeg",
+    ".gif": "image/gif", ".webp": "image/webp", ".svg": "image/svg+xml",
+}
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# JPEG SOF 마커 (크기 정보가 있는 프레임 헤더). C4/C8/CC는 SOF가 아님
+JPEG_SOF_MARKERS = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+                    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+
+# 이미지 크기 캐시: {sha256: (width, height) 또는 None}
+_size_cache = {}
+
+
+# ── 이미지 참조 ──
+
+def file_sha256(path):
+    """파일 내용을 청크 단위로 읽어 sha256 해시를 계산합니다."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def resolve_image(source_dir, raw_path):
+    """마크다운에 적힌 이미지 경로를 실제 파일과 연결한 이미지 참조를 만듭니다."""
+    # URL 인코딩된 경로 디코딩 (예: image%202.png → image 2.png)
+    rel_path = urllib.parse.unquote(raw_path)
+    abs_path = os.path.join(source_dir, rel_path)
+    ext = os.path.splitext(abs_path)[1].lower()
+
+    ref = {
+        "raw_path": raw_path,
+        "rel_path": rel_path,
+        "abs_path": abs_path,
+        "exists": os.path.isfile(abs_path),
+        "size": 0,
+        "sha256": None,
+        "mime": MIME_MAP.get(ext, "image/png"),
+    }
+    if ref["exists"]:
+        ref["size"] = os.path.getsize(abs_path)
+        ref["sha256"] = file_sha256(abs_path)
+    return ref
+
+
+# ── 이미지 크기 (헤더만 읽음) ──
+
+def _exif_orientation(data):
+    """APP1 세그먼트의 Exif IFD0에서 방향(Orientation, 0x0112) 값을 읽습니다. 없으면 1."""
+    if data[:6] != b"Exif\0\0":
+        return 1
+    tiff = data[6:]
+    endian = {b"II": "<", b"MM": ">"}.get(tiff[:2])
+    if endian is None:
+        return 1
+    try:
+        ifd = struct.unpack(endian + "I", tiff[4:8])[0]
+        count = struct.unpack(endian + "H", tiff[ifd:ifd + 2])[0]
+        for i in range(count):
+            entry = tiff[ifd + 2 + 12 * i:ifd + 14 + 12 * i]
+            if len(entry) < 12:
+                break
+            if struct.unpack(endian + "H", entry[:2])[0] == 0x0112:
+                return struct.unpack(endian + "H", entry[8:10])[0]
+    except struct.error:
+        pass  # 잘리거나 깨진 Exif는 무시하고 SOF 크기를 그대로 사용
+    return 1
+
+
+def _probe_jpeg(f):
+    """JPEG 마커를 따라가며 SOF 헤더에서 크기를 읽습니다.
+    Exif 방향이 5~8(90도 회전)이면 화면에 보이는 대로 가로/세로를 바꿉니다."""
+    orientation = 1
+    f.seek(2)
+    while True:
+        byte = f.read(1)
+        while byte and byte != b"\xff":
+            byte = f.read(1)
+        while byte == b"\xff":
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+            continue  # 길이 없는 마커
+        seg_len = f.read(2)
+        if len(seg_len) < 2:
+            return None
+        seg_len = struct.unpack(">H", seg_len)[0]
+        if marker == 0xE1:
+            # APP1 (Exif)은 SOF보다 앞에 있으므로 방향 값을 먼저 읽어 둔다
+            data = f.read(seg_len - 2)
+            if data[:6] == b"Exif\0\0":
+                orientation = _exif_orientation(data)
+            continue
+        if marker in JPEG_SOF_MARKERS:
+            data = f.read(5)
+            if len(data) < 5:
+                return None
+            height, width = struct.unpack(">HH", data[1:5])
+            if orientation >= 5:
+                width, height = height, width
+            return width, height
+        f.seek(seg_len - 2, os.SEEK_CUR)
+
+
+def probe_image_size(path):
+    """PNG/JPEG/GIF/WebP 파일 헤더만 읽어 (width, height)를 반환합니다. 모르면 None."""
+    with open(path, "rb") as f:
+        head = f.read(32)
+
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            return struct.unpack(">II", head[16:24])
+
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            return struct.unpack("<HH", head[6:10])
+
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            chunk = head[12:16]
+            if chunk == b"VP8 ":
+                w, h = struct.unpack("<HH", head[26:30])
+                return w & 0x3FFF, h & 0x3FFF
+            if chunk == b"VP8L":
+                bits = int.from_bytes(head[21:25], "little")
+                return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+            if chunk == b"VP8X":
+                w = int.from_bytes(head[24:27], "little") + 1
+                h = int.from_bytes(head[27:30], "little") + 1
+                return w, h
+            return None
+
+        if head[:2] == b"\xff\xd8":
+            return _probe_jpeg(f)
+
+    return None
+
+
+def get_image_size(image):
+    """이미지 참조의 (width, height)를 반환합니다. 파일 해시 기준으로 캐시합니다."""
+    if not image["exists"]:
+        return None
+    sha = image["sha256"]
+    if sha not in _size_cache:
+        try:
+            _size_cache[sha] = probe_image_size(image["abs_path"])
+        except (OSError, struct.error):
+            _size_cache[sha] = None
+    return _size_cache[sha]
+
+
+def image_attrs(image):
+    """이미지 태그에 붙일 속성 문자열 (width/height + 지연 로딩).
+    HTML <img>와 Kramdown 속성 목록 {: ... } 에서 같은 형식으로 사용합니다."""
+    attrs = []
+    size = get_image_size(image)
+    if size:
+        attrs.append(f'width="{size[0]}" height="{size[1]}"')
+    attrs.append('loading="lazy" decoding="async"')
+    return " ".join(attrs)
+
+
+# ── 노트 파싱 ──
+
+def parse_note(md_file_path):
+    """UpNote 마크다운 파일을 한 번 읽어 중간 문서로 변환합니다."""
+
+    with open(md_file_path, "r", encoding="utf-8") as f:
+        content = f.read()
+
+    source_dir = os.path.dirname(md_file_path)
+    content_sha256 = hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    # 제목 추출: 문서 맨 앞의 '# 제목' (본문에서 제거), 없으면 파일 이름
+    title_match = TITLE_PATTERN.match(content)
+    if title_match:
+        title = title_match.group(1).strip()
+        content = content[:title_match.start()] + content[title_match.end():]
+        content = content.lstrip("\n")
+    else:
+        title = os.path.splitext(os.path.basename(md_file_path))[0]
+
+    # 본문을 텍스트/이미지 블록으로 분리 (같은 이미지는 한 번만 해시)
+    blocks = []
+    images = {}
+    pos = 0
+    for match in IMAGE_PATTERN.finditer(content):
+        if match.start() > pos:
+            blocks.append({"type": "text", "text": content[pos:match.start()]})
+
+        raw_path = match.group(2)
+        rel_path = urllib.parse.unquote(raw_path)
+        if rel_path not in images:
+            images[rel_path] = resolve_image(source_dir, raw_path)
+
+        blocks.append({
+            "type": "image",
+            "alt": match.group(1),
+            "raw_path": raw_path,
+            "source": match.group(0),
+            "image": images[rel_path],
+        })
+        pos = match.end()
+    if pos < len(content):
+        blocks.append({"type": "text", "text": content[pos:]})
+
+    return {
+        "source_path": md_file_path,
+        "source_dir": source_dir,
+        "sha256": content_sha256,
+        "title": title,
+        "blocks": blocks,
+        "images": images,
+    }
+
+
+def render_blocks(doc, render_image):
+    """블록을 다시 이어 붙입니다. 이미지 블록은 render_image(block)의 결과로 치환됩니다."""
+    parts = []
+    for block in doc["blocks"]:
+        if block["type"] == "text":
+            parts.append(block["text"])
+        else:
+            parts.append(render_image(block))
+    return "".join(parts)